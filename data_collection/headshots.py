@@ -0,0 +1,110 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from tqdm import tqdm
+from data_collection import http_client
+
+HEADSHOT_URL = "https://content.mlb.com/images/headshots/current/168x168/{player_id}.png"
+HEADSHOT_DIR = "mlb_headshots"
+MANIFEST_PATH = os.path.join(HEADSHOT_DIR, "manifest.json")
+IMAGE_EXTENSIONS = (".png", ".jpg")
+
+# Seconds before an image is checked with the server again
+HEADSHOT_TTL = 24 * 3600
+MAX_WORKERS = 8
+
+def image_extension(content):
+    """File extension matching the image bytes (the CDN serves both PNG and JPEG)."""
+    if content.startswith(b"\x89PNG"):
+        return ".png"
+    return ".jpg"
+
+def find_headshot(player_id, image_dir=HEADSHOT_DIR):
+    """Path of a player's headshot, whichever extension it was saved with."""
+    for ext in IMAGE_EXTENSIONS:
+        path = os.path.join(image_dir, f"{player_id}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+def load_manifest(path=MANIFEST_PATH):
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+def sync_headshot(player_id, entry):
+    """Bring one headshot up to date. Returns (status, manifest entry)."""
+    path = os.path.join(HEADSHOT_DIR, entry["file"]) if entry else None
+    have_file = path is not None and os.path.exists(path)
+
+    if have_file and time.time() - entry.get("checked_at", 0) < HEADSHOT_TTL:
+        return "unchanged", entry
+
+    headers = {"If-None-Match": entry["etag"]} if have_file and entry.get("etag") else {}
+
+    try:
+        r = http_client.get(HEADSHOT_URL.format(player_id=player_id), timeout=10, headers=headers)
+    except Exception as e:
+        print(f"❌ Error downloading headshot for ID {player_id}: {e}")
+        return "failed", entry
+
+    if r.status_code == 304:
+        return "unchanged", dict(entry, checked_at=time.time())
+
+    if r.status_code != 200:
+        print(f"❌ No image for player ID {player_id} (status {r.status_code})")
+        return "failed", entry
+
+    digest = hashlib.sha256(r.content).hexdigest()
+    new_entry = {
+        "file": f"{player_id}{image_extension(r.content)}",
+        "etag": r.headers.get("ETag"),
+        "size": len(r.content),
+        "sha256": digest,
+        "checked_at": time.time(),
+    }
+
+    if have_file and entry.get("sha256") == digest and entry["file"] == new_entry["file"]:
+        return "unchanged", new_entry
+
+    with open(os.path.join(HEADSHOT_DIR, new_entry["file"]), "wb") as f:
+        f.write(r.content)
+
+    # Drop a copy saved under the other extension (older runs saved PNGs as .jpg)
+    for ext in IMAGE_EXTENSIONS:
+        stale = os.path.join(HEADSHOT_DIR, f"{player_id}{ext}")
+        if stale != os.path.join(HEADSHOT_DIR, new_entry["file"]) and os.path.exists(stale):
+            os.remove(stale)
+
+    return ("changed" if have_file else "added"), new_entry
+
+def sync_headshots(player_ids, max_workers=MAX_WORKERS):
+    """Download new or changed headshots in parallel and return counts per status."""
+    os.makedirs(HEADSHOT_DIR, exist_ok=True)
+    manifest = load_manifest()
+    player_ids = list(dict.fromkeys(pid for pid in player_ids if pid))
+    counts = {"added": 0, "changed": 0, "unchanged": 0, "failed": 0}
+
+    def work(player_id):
+        return player_id, *sync_headshot(player_id, manifest.get(str(player_id)))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for player_id, status, entry in tqdm(executor.map(work, player_ids),
+                                             total=len(player_ids), desc="Headshots"):
+            counts[status] += 1
+            if entry:
+                manifest[str(player_id)] = entry
+
+    save_manifest(manifest)
+    print(f"🖼️ Headshots: {counts['added']} added, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged, {counts['failed']} failed")
+    return counts
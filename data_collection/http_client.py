@@ -0,0 +1,194 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit, parse_qsl
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared connection pool size and default request rate (requests per second)
+POOL_SIZE = 16
+DEFAULT_RATE = float(os.environ.get("MLB_HTTP_RATE", 10))
+DEFAULT_BURST = 10
+
+# Retries for 429 / 5xx / connection errors, with exponential backoff in seconds
+MAX_RETRIES = 4
+BACKOFF = 0.5
+
+# On-disk response cache used by get_json
+CACHE_DIR = os.environ.get("MLB_HTTP_CACHE", ".http_cache")
+
+# Record/replay (see replay_server.py):
+#   MLB_RECORD_DIR  save every successful live response under this directory
+#   MLB_REPLAY_URL  send all requests to a replay server, e.g. http://127.0.0.1:8099
+RECORD_DIR = os.environ.get("MLB_RECORD_DIR")
+REPLAY_URL = os.environ.get("MLB_REPLAY_URL")
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `burst` requests at once, refilled at `rate` per second."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+_session = None
+_session_lock = threading.Lock()
+limiter = TokenBucket()
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+def set_rate_limit(rate, burst=None):
+    """Replace the shared limiter, e.g. to back off against a stricter endpoint."""
+    global limiter
+    limiter = TokenBucket(rate, burst if burst is not None else max(1, int(rate)))
+
+def resolve_url(url):
+    """Point a live API URL at the replay server when MLB_REPLAY_URL is set.
+
+    https://statsapi.mlb.com/api/v1/teams -> {REPLAY_URL}/statsapi.mlb.com/api/v1/teams
+    """
+    if not REPLAY_URL:
+        return url
+    parts = urlsplit(url)
+    return f"{REPLAY_URL.rstrip('/')}/{parts.netloc}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+def record_key(url):
+    """(host, key) identifying a recorded response; query order does not matter."""
+    parts = urlsplit(url)
+    query = sorted(parse_qsl(parts.query, keep_blank_values=True))
+    key = json.dumps([parts.path, query])
+    return parts.netloc, hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+def record_response(resp):
+    """Save a live response under RECORD_DIR so replay_server can serve it."""
+    host, key = record_key(resp.request.url)
+    folder = os.path.join(RECORD_DIR, host)
+    os.makedirs(folder, exist_ok=True)
+
+    with open(os.path.join(folder, key + ".body"), "wb") as f:
+        f.write(resp.content)
+
+    meta = {
+        "url": resp.request.url,
+        "status": resp.status_code,
+        "headers": {k.lower(): v for k, v in resp.headers.items()
+                    if k.lower() in ("content-type", "etag", "last-modified")},
+    }
+    with open(os.path.join(folder, key + ".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+def get(url, params=None, timeout=10, **kwargs):
+    """Rate-limited GET through the shared session.
+
+    429 and 5xx responses (and connection errors) are retried with backoff,
+    honouring Retry-After. The last response is returned either way.
+    """
+    url = resolve_url(url)
+
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        try:
+            resp = get_session().get(url, params=params, timeout=timeout, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(BACKOFF * 2 ** attempt)
+            continue
+
+        if (resp.status_code == 429 or resp.status_code >= 500) and attempt < MAX_RETRIES:
+            retry_after = resp.headers.get("Retry-After", "")
+            time.sleep(float(retry_after) if retry_after.isdigit() else BACKOFF * 2 ** attempt)
+            continue
+        break
+
+    if RECORD_DIR and resp.status_code == 200 and not REPLAY_URL:
+        record_response(resp)
+    return resp
+
+def cache_path(url, params=None):
+    """Cache file for a URL + params pair (params are order-independent)."""
+    key = json.dumps([url, sorted((params or {}).items())], default=str)
+    return os.path.join(CACHE_DIR, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+def _read_cache(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _write_cache(path, entry):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(tmp, path)
+
+def get_json(url, params=None, ttl=0, timeout=10):
+    """GET a JSON document through the on-disk cache.
+
+    Entries younger than `ttl` seconds are returned without a request. Older
+    entries are revalidated with If-None-Match / If-Modified-Since, so an
+    unchanged resource only costs a 304. Raises requests.HTTPError on failure.
+    In record mode the cache is bypassed so every response is fetched in full
+    and recorded; the cache is still refreshed afterwards.
+    """
+    path = cache_path(url, params)
+    recording = RECORD_DIR and not REPLAY_URL
+    entry = None if recording else _read_cache(path)
+
+    if entry and time.time() - entry["fetched_at"] < ttl:
+        return entry["body"]
+
+    headers = {}
+    if entry:
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    resp = get(url, params=params, timeout=timeout, headers=headers)
+
+    if resp.status_code == 304 and entry:
+        entry["fetched_at"] = time.time()
+        _write_cache(path, entry)
+        return entry["body"]
+
+    resp.raise_for_status()
+    body = resp.json()
+    _write_cache(path, {
+        "url": url,
+        "params": params,
+        "etag": resp.headers.get("ETag"),
+        "last_modified": resp.headers.get("Last-Modified"),
+        "fetched_at": time.time(),
+        "body": body,
+    })
+    return body
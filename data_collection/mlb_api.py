@@ -1,8 +1,11 @@
 import os
+import re
 import json
-import time
-import requests
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from tqdm import tqdm
+from data_collection import http_client
+from data_collection.headshots import sync_headshots
 
 BASE_URL = "https://statsapi.mlb.com/api/v1"
 
@@ -28,14 +31,27 @@ POSITION_ORDER = {
     "LF": 6, "CF": 7, "RF": 8, "DH": 9
 }
 
-HEADSHOT_DIR = "mlb_headshots"
-os.makedirs(HEADSHOT_DIR, exist_ok=True)
+# Seconds a cached response is reused before it is revalidated
+CACHE_TTL = {
+    "teams": 7 * 24 * 3600,
+    "roster": 6 * 3600,
+    "people": 24 * 3600,
+}
+
+# Finished teams are written here as one NDJSON file each so a failed run can resume
+CHECKPOINT_DIR = "jsons/checkpoints/rosters"
+
+# Max IDs per /people?personIds= request
+PEOPLE_CHUNK_SIZE = 100
+
+# Number of players fetched in parallel (requests are still capped by http_client's rate limiter)
+MAX_WORKERS = 8
 
 def get_all_team_info():
     """Get all active MLB teams: {team_name: team_id}"""
-    resp = requests.get(f"{BASE_URL}/teams", params={"sportId": 1, "activeStatus": "Yes"})
-    resp.raise_for_status()
-    teams = resp.json()["teams"]
+    data = http_client.get_json(f"{BASE_URL}/teams", params={"sportId": 1, "activeStatus": "Yes"},
+                                ttl=CACHE_TTL["teams"])
+    teams = data["teams"]
     return {team["name"]: team["id"] for team in teams}
 
 # def get_40man_roster(team_id):
@@ -50,11 +66,16 @@ def get_all_team_info():
 #         return STATUS_PRIORITY.get(code, float("inf"))
 
 #     return sorted(full_roster, key=status_priority)[:40]
-def get_40man_roster(team_id):
-    """Get top 40 players by roster status."""
-    resp = requests.get(f"{BASE_URL}/teams/{team_id}/roster/40Man")
-    resp.raise_for_status()
-    full_roster = resp.json().get("roster", [])
+def get_40man_roster(team_id, hydrate=False):
+    """Get top 40 players by roster status.
+
+    With hydrate=True each entry's "person" carries the full /people record,
+    so no per-player requests are needed afterwards.
+    """
+    params = {"hydrate": "person"} if hydrate else None
+    data = http_client.get_json(f"{BASE_URL}/teams/{team_id}/roster/40Man", params=params,
+                                ttl=CACHE_TTL["roster"])
+    full_roster = data.get("roster", [])
 
     # Sort by status priority
     def status_priority(player):
@@ -67,13 +88,8 @@ def get_40man_roster(team_id):
     return full_roster, top_40
 
 
-def get_player_info(player_id):
-    """Fetch full player info from MLB API."""
-    url = f"{BASE_URL}/people/{player_id}"
-    resp = requests.get(url)
-    resp.raise_for_status()
-    player = resp.json().get("people", [])[0]
-
+def parse_player_info(player):
+    """Reduce a /people record to the fields we store per player."""
     return {
         "id": player.get("id"),
         "firstName": player.get("fullName").split()[0],
@@ -83,24 +99,63 @@ def get_player_info(player_id):
         "jersey_number": player.get("primaryNumber", "0"),
         "weight": player.get("weight", 200),
         "age": player.get("currentAge", 18),
+        "bat_side": player.get("batSide", {}).get("code"),
+        "throw_hand": player.get("pitchHand", {}).get("code"),
     }
 
-def download_headshot(player_id):
-    """Download and save MLB headshot from content.mlb.com using player ID."""
-    url = f"https://content.mlb.com/images/headshots/current/168x168/{player_id}.png"
-    path = os.path.join("mlb_headshots", f"{player_id}.jpg")
+def get_player_info(player_id):
+    """Fetch full player info from MLB API."""
+    url = f"{BASE_URL}/people/{player_id}"
+    data = http_client.get_json(url, ttl=CACHE_TTL["people"])
+    player = data.get("people", [])[0]
+
+    return parse_player_info(player)
+
+def get_players_info(player_ids, chunk_size=PEOPLE_CHUNK_SIZE):
+    """Fetch player info for many IDs, one request per chunk: {player_id: info}"""
+    players = {}
+    for i in range(0, len(player_ids), chunk_size):
+        chunk = player_ids[i:i + chunk_size]
+        data = http_client.get_json(f"{BASE_URL}/people",
+                                    params={"personIds": ",".join(str(pid) for pid in chunk)},
+                                    ttl=CACHE_TTL["people"])
+        for person in data.get("people", []):
+            try:
+                players[person["id"]] = parse_player_info(person)
+            except Exception as e:
+                print(f"⚠️ Error parsing player {person.get('id')}: {e}")
+    return players
+
+def get_roster_details(roster_entries):
+    """Player info for roster entries, in roster order.
+
+    Uses persons hydrated on the roster call and batches any that are missing
+    into /people?personIds= requests instead of one request per player.
+    """
+    details = {}
+    missing = []
+    for entry in roster_entries:
+        person = entry.get("person", {})
+        player_id = person.get("id")
+        if not player_id:
+            continue
+        if "height" in person:
+            try:
+                details[player_id] = parse_player_info(person)
+                continue
+            except Exception as e:
+                print(f"⚠️ Error parsing player {player_id}: {e}")
+        missing.append(player_id)
+
+    if missing:
+        details.update(get_players_info(missing))
 
-    try:
-        r = requests.get(url, timeout=10)
-        if r.status_code == 200:
-            with open(path, "wb") as f:
-                f.write(r.content)
-            return True
-        else:
-            print(f"❌ No image for player ID {player_id} (status {r.status_code})")
-    except Exception as e:
-        print(f"❌ Error downloading headshot for ID {player_id}: {e}")
-    return False
+    ordered = []
+    for entry in roster_entries:
+        info = details.get(entry.get("person", {}).get("id"))
+        if info and info["firstName"] and info["lastName"]:
+            ordered.append(info)
+    return ordered
 
 # def build_all_rosters():
 #     team_map = get_all_team_info()
@@ -134,10 +189,54 @@ def download_headshot(player_id):
 #         rosters[team] = team_roster
 
 #     return rosters
-def build_all_rosters():
+def fetch_player(player_entry):
+    """Fetch details for one roster entry. Returns None if the player is skipped."""
+    player_id = player_entry.get("person", {}).get("id")
+    if not player_id:
+        return None
+
+    try:
+        details = get_player_info(player_id)
+        if details["firstName"] and details["lastName"]:
+            return details
+    except Exception as e:
+        print(f"⚠️ Error getting player {player_id}: {e}")
+    return None
+
+def checkpoint_path(team):
+    slug = re.sub(r"[^a-z0-9]+", "_", team.lower()).strip("_")
+    return os.path.join(CHECKPOINT_DIR, f"{slug}.ndjson")
+
+def save_team_checkpoint(team, team_roster):
+    """Write one finished team (one player per line); the rename makes it all-or-nothing."""
+    os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+    path = checkpoint_path(team)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        for player in team_roster:
+            f.write(json.dumps(player) + "\n")
+    os.replace(path + ".tmp", path)
+
+def load_team_checkpoint(team):
+    """Players of a team finished by an earlier run, or None."""
+    path = checkpoint_path(team)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def clear_checkpoints():
+    """Remove every team checkpoint; called before a fresh run and after a finished one is saved."""
+    if os.path.isdir(CHECKPOINT_DIR):
+        for name in os.listdir(CHECKPOINT_DIR):
+            os.remove(os.path.join(CHECKPOINT_DIR, name))
+
+def build_all_rosters(max_workers=MAX_WORKERS, batch=True, headshots=True, resume=False):
     team_map = get_all_team_info()
     rosters = {}
 
+    if not resume:
+        clear_checkpoints()
+
     # Template filler player
     filler_template = {
         "id": 0,
@@ -150,43 +249,47 @@ def build_all_rosters():
         "age": 18,
     }
 
-    for team in TEAM_ORDER:
-        team_id = team_map.get(team)
-        if not team_id:
-            print(f"❌ Team '{team}' not found")
-            continue
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for team in TEAM_ORDER:
+            team_id = team_map.get(team)
+            if not team_id:
+                print(f"❌ Team '{team}' not found")
+                continue
 
-        print(f"\n⏳ Fetching 40-man roster for {team}...")
+            if resume:
+                team_roster = load_team_checkpoint(team)
+                if team_roster is not None:
+                    rosters[team] = team_roster
+                    print(f"⏩ {team}: loaded {len(team_roster)} players from checkpoint")
+                    continue
 
-        full_roster, selected_roster = get_40man_roster(team_id)
-        team_roster = []
+            print(f"\n⏳ Fetching 40-man roster for {team}...")
 
-        for player_entry in tqdm(selected_roster, desc=team[:20]):
-            player_id = player_entry.get("person", {}).get("id")
-            if not player_id:
-                continue
+            full_roster, selected_roster = get_40man_roster(team_id, hydrate=batch)
 
-            try:
-                details = get_player_info(player_id)
-                if details["firstName"] and details["lastName"]:
-                    download_headshot(player_id)
-                    team_roster.append(details)
-                    time.sleep(0.1)
-            except Exception as e:
-                print(f"⚠️ Error getting player {player_id}: {e}")
+            # executor.map keeps roster order, so the position sort below stays stable
+            if batch:
+                team_roster = get_roster_details(selected_roster)
+            else:
+                fetched = executor.map(fetch_player, selected_roster)
+                team_roster = [p for p in tqdm(fetched, total=len(selected_roster), desc=team[:20]) if p]
 
-        # 🔹 Fill with Joe Random if under 40
-        while len(team_roster) < 40:
-            filler = filler_template.copy()
-            filler["jersey_number"] = str(len(team_roster) + 1)  # unique number per filler
-            team_roster.append(filler)
+            # 🔹 Fill with Joe Random if under 40
+            while len(team_roster) < 40:
+                filler = filler_template.copy()
+                filler["jersey_number"] = str(len(team_roster) + 1)  # unique number per filler
+                team_roster.append(filler)
 
-        # Sort players by POSITION_ORDER
-        team_roster.sort(key=lambda p: POSITION_ORDER.get(p.get("position"), float("inf")))
-        rosters[team] = team_roster
+            # Sort players by POSITION_ORDER
+            team_roster.sort(key=lambda p: POSITION_ORDER.get(p.get("position"), float("inf")))
+            rosters[team] = team_roster
+            save_team_checkpoint(team, team_roster)
 
-        print(f"✅ {team}: using {len(selected_roster)} players out of {len(full_roster)} available, "
-              f"filled {len(team_roster)}")
+            print(f"✅ {team}: using {len(selected_roster)} players out of {len(full_roster)} available, "
+                  f"filled {len(team_roster)}")
+
+    if headshots:
+        sync_headshots(p["id"] for players in rosters.values() for p in players)
 
     return rosters
 
@@ -196,7 +299,14 @@ def save_rosters_to_file(rosters, filename="jsons/mlb_players.json"):
     print(f"\n✅ Saved to {filename}")
 
 if __name__ == "__main__":
-    rosters = build_all_rosters()
+    parser = argparse.ArgumentParser(description="Fetch 40-man rosters for every MLB team.")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse teams checkpointed by a previous (failed) run")
+    args = parser.parse_args()
+
+    rosters = build_all_rosters(resume=args.resume)
     save_rosters_to_file(rosters)
+    # The run finished, so a later --resume must start fresh rather than reuse these teams
+    clear_checkpoints()
     for team, players in rosters.items():
         print(f"{team}: {len(players)} players")
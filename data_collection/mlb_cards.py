@@ -1,107 +1,334 @@
 import requests
 import json
-import time
 import os
-from collections import defaultdict
+import re
+import time
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from data_collection import http_client
+from util.names import card_name_key, player_name_key
+
+ITEMS_URL = "https://mlb25.theshow.com/apis/items.json"
+CARDS_PATH = "jsons/mlb_cards.json"
+
+# Seconds a cached card page is reused before it is revalidated
+CARDS_CACHE_TTL = 12 * 3600
+
+# Pages fetched in parallel after page 1, and extra attempts per failed page
+MAX_WORKERS = 8
+PAGE_RETRIES = 2
+
+# Last fetched copy of every catalog page, and the changes found by the latest refresh
+PAGE_DIR = "jsons/card_pages"
+CHANGELOG_PATH = "jsons/mlb_cards_changelog.json"
+
+# Targeted mode: cards looked up per rostered player and cached by player ID
+PLAYERS_PATH = "jsons/mlb_players.json"
+CARD_CACHE_DIR = "jsons/card_cache"
+PLAYER_CARD_TTL = 24 * 3600
+
+# Fields kept on every stored card, whatever the whitelist, for dedup and the changelog
+CARD_KEY_FIELDS = ("uuid", "name", "series", "ovr", "team")
+
+def card_priority(card):
+    """Sort key for picking a player's card: Live series first, then highest OVR."""
+    return card.get("series") == "Live", card.get("ovr", 0)
+
+def project_card(card, fields):
+    """Keep only whitelisted fields (plus CARD_KEY_FIELDS). An empty whitelist keeps everything."""
+    if not fields:
+        return card
+    return {k: v for k, v in card.items() if k in fields or k in CARD_KEY_FIELDS}
+
+class BestCardPicker:
+    """Single-pass dedup: keeps the best card seen so far for each name."""
+
+    def __init__(self):
+        self.best = {}
+        self.counts = {}
+
+    def add(self, card):
+        name = card["name"]
+        self.counts[name] = self.counts.get(name, 0) + 1
+        current = self.best.get(name)
+        if current is None or card_priority(card) > card_priority(current):
+            self.best[name] = card
+
+    def print_summary(self):
+        duplicates_removed = 0
+        for name, count in self.counts.items():
+            if count > 1:
+                card = self.best[name]
+                duplicates_removed += count - 1
+                print(f"Duplicate cards for {name}: {count} cards, kept "
+                      f"OVR {card['ovr']} | {card['series']} | {card.get('team')} | UUID: {card['uuid']}")
+        print(f"\nTotal duplicates removed: {duplicates_removed}")
+
+def fetch_page(page):
+    """Fetch one items.json page, or None if every attempt fails."""
+    params = {"type": "mlb_card", "page": page}
+    for attempt in range(PAGE_RETRIES + 1):
+        try:
+            return http_client.get_json(ITEMS_URL, params=params, ttl=CARDS_CACHE_TTL)
+        except (requests.RequestException, ValueError) as e:
+            error = e
+    print(f"Failed to fetch page {page}: {error}")
+    return None
+
+def fetch_card_pages(max_workers=MAX_WORKERS):
+    """Yield (page, items) for the whole catalog, in page order.
+
+    Page 1 tells us total_pages; the rest are fetched concurrently.
+    items is None for a page that could not be fetched.
+    """
+    first = fetch_page(1)
+    if not first:
+        return
+    yield 1, first.get("items", [])
+
+    total_pages = first.get("total_pages", 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pages = range(2, total_pages + 1)
+        for page, data in zip(pages, executor.map(fetch_page, pages)):
+            yield page, data.get("items", []) if data else None
+
+def page_path(page):
+    return os.path.join(PAGE_DIR, f"page_{page:04d}.json")
+
+def stored_pages():
+    """Page numbers currently in PAGE_DIR, ascending."""
+    if not os.path.isdir(PAGE_DIR):
+        return []
+    pages = []
+    for name in os.listdir(PAGE_DIR):
+        match = re.fullmatch(r"page_(\d+)\.json", name)
+        if match:
+            pages.append(int(match.group(1)))
+    return sorted(pages)
+
+def load_page(page):
+    path = page_path(page)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def page_hash(items):
+    return hashlib.sha256(json.dumps(items, sort_keys=True).encode("utf-8")).hexdigest()
+
+def iter_stored_cards():
+    """Every card in the page store, in page order."""
+    for page in stored_pages():
+        yield from load_page(page)["items"]
+
+def card_changes(old, new, fields):
+    """{field: [old, new]} for tracked fields whose value moved."""
+    return {f: [old.get(f), new.get(f)] for f in fields if old.get(f) != new.get(f)}
+
+def refresh_card_pages(tracked_fields=None):
+    """Fetch the catalog and rewrite only the stored pages whose contents changed.
+
+    Cards are matched by uuid (also across pages, since the catalog order can
+    shift). Returns a changelog of added, removed and changed cards, or None
+    if the catalog could not be fetched.
+    """
+    os.makedirs(PAGE_DIR, exist_ok=True)
+    added, removed, changed = {}, {}, []
+    seen_pages = set()
+    pages_written = 0
+
+    for page, items in fetch_card_pages():
+        seen_pages.add(page)
+        if items is None:
+            continue
+
+        # Project as soon as the page arrives so full card dicts are never kept
+        items = [project_card(card, tracked_fields) for card in items]
+        digest = page_hash(items)
+        old = load_page(page)
+        if old and old["hash"] == digest:
+            continue
+
+        old_cards = {c["uuid"]: c for c in old["items"]} if old else {}
+        new_cards = {c["uuid"]: c for c in items}
+        for uuid, card in old_cards.items():
+            if uuid not in new_cards:
+                removed[uuid] = card
+        for uuid, card in new_cards.items():
+            if uuid in old_cards:
+                changed.append((old_cards[uuid], card))
+            else:
+                added[uuid] = card
+
+        with open(page_path(page) + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({"hash": digest, "items": items}, f)
+        os.replace(page_path(page) + ".tmp", page_path(page))
+        pages_written += 1
+        print(f"Updated page {page} with {len(items)} items")
+
+    if not seen_pages:
+        return None
+
+    # Pages past the end of a shrunken catalog
+    for page in stored_pages():
+        if page > max(seen_pages):
+            removed.update({c["uuid"]: c for c in load_page(page)["items"]})
+            os.remove(page_path(page))
 
-def fetch_all_mlb_cards(include_attributes=None):
-    """Fetch all MLB cards and save only specified attributes.
+    # A card that left one page and landed on another is a move, not an add + remove
+    for uuid in set(added) & set(removed):
+        changed.append((removed.pop(uuid), added.pop(uuid)))
+
+    changelog = {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "changed": [],
+                 "added": [{"uuid": c["uuid"], "name": c.get("name")} for c in added.values()],
+                 "removed": [{"uuid": c["uuid"], "name": c.get("name")} for c in removed.values()]}
+
+    for old, new in changed:
+        fields = tracked_fields or sorted(set(old) | set(new))
+        diff = card_changes(old, new, [f for f in fields if f != "ovr"])
+        if old.get("ovr") == new.get("ovr") and not diff:
+            continue
+        entry = {"uuid": new["uuid"], "name": new.get("name")}
+        if old.get("ovr") != new.get("ovr"):
+            entry["ovr"] = [old.get("ovr"), new.get("ovr")]
+        if diff:
+            entry["attributes"] = diff
+        changelog["changed"].append(entry)
+
+    print(f"Rewrote {pages_written} of {len(seen_pages)} pages: {len(changelog['changed'])} changed, "
+          f"{len(changelog['added'])} added, {len(changelog['removed'])} removed cards")
+    return changelog
+
+def search_cards(name):
+    """All mlb_card items returned by the API's name filter."""
+    params = {"type": "mlb_card", "name": name}
+    data = http_client.get_json(ITEMS_URL, params=params, ttl=CARDS_CACHE_TTL)
+    cards = data.get("items", [])
+    for page in range(2, data.get("total_pages", 1) + 1):
+        more = http_client.get_json(ITEMS_URL, params=dict(params, page=page), ttl=CARDS_CACHE_TTL)
+        cards.extend(more.get("items", []))
+    return cards
+
+def fetch_player_card(player):
+    """Best card for one rostered player, cached in CARD_CACHE_DIR. None if no card matches."""
+    path = os.path.join(CARD_CACHE_DIR, f"{player['id']}.json")
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+        if time.time() - cached["fetched_at"] < PLAYER_CARD_TTL:
+            return cached["card"]
+
+    key = player_name_key(player)
+    # The name filter is a substring search; fall back to the last name when
+    # the full name finds nothing (e.g. "Mike" vs "Michael")
+    for query in (f"{player['firstName']} {player['lastName']}", player["lastName"]):
+        matches = [c for c in search_cards(query) if card_name_key(c.get("name")) == key]
+        if matches:
+            break
+
+    card = max(matches, key=card_priority) if matches else None
+
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"fetched_at": time.time(), "card": card}, f)
+    os.replace(path + ".tmp", path)
+    return card
+
+def fetch_rostered_cards(include_attributes=None, rosters=None, save=True, max_workers=MAX_WORKERS):
+    """Fetch cards only for rostered players and return them.
+
+    rosters defaults to the contents of mlb_players.json; with save=True the
+    cards are also written to mlb_cards.json.
+    """
+    if rosters is None:
+        with open(PLAYERS_PATH, "r", encoding="utf-8") as f:
+            rosters = json.load(f)
+
+    # Skip "Joe Random" fillers (id 0)
+    players = [p for team in rosters.values() for p in team if p.get("id")]
+    os.makedirs(CARD_CACHE_DIR, exist_ok=True)
+
+    def lookup(player):
+        try:
+            return fetch_player_card(player)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Failed to look up card for {player['firstName']} {player['lastName']}: {e}")
+            return None
+
+    cards = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for player, card in zip(players, executor.map(lookup, players)):
+            if card:
+                cards.setdefault(card["uuid"], card)
+            else:
+                print(f"No card for: {player['firstName']} {player['lastName']}")
+
+    filtered_cards = [{k: v for k, v in card.items() if k in include_attributes} if include_attributes else card
+                      for card in cards.values()]
+
+    print(f"\nFound {len(filtered_cards)} cards for {len(players)} rostered players")
+    if save:
+        with open(CARDS_PATH, 'w') as f:
+            json.dump(filtered_cards, f, indent=2)
+        print(f"Saved to {CARDS_PATH}")
+
+    return filtered_cards
+
+def fetch_all_mlb_cards(include_attributes=None, refresh=False, save=True):
+    """Fetch all MLB cards, keeping only specified attributes, and return them.
     
     Args:
         include_attributes (list): List of attribute names to keep in the output.
                                   If None, keeps all attributes.
+        refresh (bool): Rebuild mlb_cards.json even if it exists. Only pages
+                        whose contents changed are rewritten, and the changed
+                        cards are listed in mlb_cards_changelog.json.
+        save (bool): Write the cards to mlb_cards.json.
     """
     if include_attributes is None:
         include_attributes = []  # Empty list means keep all (we'll handle this later)
 
-    if os.path.exists("jsons/mlb_cards.json"):
+    if os.path.exists(CARDS_PATH) and not refresh:
         print("mlb_cards.json already exists. Skipping fetch.")
+        with open(CARDS_PATH, "r") as f:
+            return json.load(f)
+
+    # Step 1: Bring the local page store up to date
+    changelog = refresh_card_pages(include_attributes)
+    if changelog is None:
+        print("Failed to fetch the card catalog")
         return
 
-    all_cards = []
-    page = 1
+    with open(CHANGELOG_PATH, "w") as f:
+        json.dump(changelog, f, indent=2)
 
-    # Step 1: Fetch all cards from API
-    while True:
-        url = "https://mlb25.theshow.com/apis/items.json"
-        params = {"type": "mlb_card", "page": page}
-        response = requests.get(url, params=params)
+    # Step 2: Stream the stored cards, keeping the best card per player name
+    picker = BestCardPicker()
+    for card in iter_stored_cards():
+        picker.add(card)
+    picker.print_summary()
 
-        if response.status_code != 200:
-            print(f"Failed to fetch page {page}")
-            break
-
-        data = response.json()
-        items = data.get("items", [])
-        if not items:
-            break
+    # Drop the key fields that were only kept for dedup
+    filtered_cards = [{k: v for k, v in card.items() if k in include_attributes} if include_attributes else card
+                      for card in picker.best.values()]
 
-        all_cards.extend(items)
-        print(f"Fetched page {page} with {len(items)} items")
-
-        if page >= data.get("total_pages", 1):
-            break
+    # Save to file
+    if save:
+        with open(CARDS_PATH, 'w') as f:
+            json.dump(filtered_cards, f, indent=2)
 
-        page += 1
-        time.sleep(0.2)
-
-    # Step 2: Process duplicates
-    def remove_duplicates(cards):
-        player_cards = defaultdict(list)
-        for card in cards:
-            player_name = card['name']
-            player_cards[player_name].append(card)
-        
-        unique_cards = []
-        duplicates_removed = 0
-        
-        for player_name, cards_list in player_cards.items():
-            if len(cards_list) == 1:
-                unique_cards.append(cards_list[0])
-            else:
-                # Prioritize "Live" series, then sort by OVR descending
-                sorted_cards = sorted(cards_list, 
-                                    key=lambda x: (
-                                        x['series'] == 'Live',  # True (1) first for Live series
-                                        -x['ovr']  # Then higher OVR first
-                                    ), reverse=True)  # Reverse to get True first
-                unique_cards.append(sorted_cards[0])
-                duplicates_removed += len(cards_list) - 1
-                
-                # Print duplicate info
-                print(f"\nDuplicate cards for {player_name}:")
-                for i, card in enumerate(sorted_cards):
-                    priority_indicator = "★" if i == 0 else " "
-                    print(f"  {priority_indicator} {i+1}. OVR {card['ovr']} | {card['series']} | {card['team']} | UUID: {card['uuid']}")
-        
-        print(f"\nTotal duplicates removed: {duplicates_removed}")
-        return unique_cards
+        if include_attributes:
+            print(f"\nSaved {len(filtered_cards)} unique cards to mlb_cards.json (keeping only: {include_attributes})")
+        else:
+            print(f"\nSaved {len(filtered_cards)} unique cards to mlb_cards.json (keeping all attributes)")
 
-    # Remove duplicates
-    unique_cards = remove_duplicates(all_cards)
-    
-    # Filter to only keep specified attributes
-    filtered_cards = []
-    for card in unique_cards:
-        if include_attributes:  # If whitelist specified
-            filtered_card = {k: v for k, v in card.items() if k in include_attributes}
-        else:  # If no whitelist, keep all attributes
-            filtered_card = card
-        filtered_cards.append(filtered_card)
-    
-    # Save to file
-    with open('jsons/mlb_cards.json', 'w') as f:
-        json.dump(filtered_cards, f, indent=2)
-    
-    if include_attributes:
-        print(f"\nSaved {len(filtered_cards)} unique cards to mlb_cards.json (keeping only: {include_attributes})")
-    else:
-        print(f"\nSaved {len(filtered_cards)} unique cards to mlb_cards.json (keeping all attributes)")
+    return filtered_cards
 
 
 attributes = [
     "name",
     "ovr",
+    "age",
     "series",
     "display_position",
     "display_secondary_positions",
@@ -135,5 +362,16 @@ attributes = [
     "hr_per_bf",
 ]
 
-# Example usage - only keep these attributes:
-fetch_all_mlb_cards(include_attributes=attributes)
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch The Show card catalog.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="update an existing mlb_cards.json, rewriting only changed pages")
+    parser.add_argument("--targeted", action="store_true",
+                        help="only look up cards for players in jsons/mlb_players.json")
+    args = parser.parse_args()
+
+    # Only keep these attributes:
+    if args.targeted:
+        fetch_rostered_cards(include_attributes=attributes)
+    else:
+        fetch_all_mlb_cards(include_attributes=attributes, refresh=args.refresh)
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Local stand-in for the MLB stats, headshot and Show card APIs.
+
+Record real responses by running any collector with MLB_RECORD_DIR set (the
+HTTP cache is bypassed while recording; a separate MLB_HTTP_CACHE keeps the
+recording run from refreshing your usual one):
+
+    MLB_RECORD_DIR=recordings MLB_HTTP_CACHE=.record_cache python -m data_collection.mlb_api
+
+then serve them back and point the collectors at the server:
+
+    python -m data_collection.replay_server --dir recordings --latency 80 --rate-429 0.05
+    MLB_REPLAY_URL=http://127.0.0.1:8099 MLB_HTTP_CACHE=.replay_cache python -m data_collection.mlb_api
+"""
+import argparse
+import json
+import os
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from data_collection.http_client import record_key
+
+DEFAULT_PORT = 8099
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    # Set by serve()
+    record_dir = "recordings"
+    latency = 0.0
+    jitter = 0.0
+    error_rate = 0.0
+    rate_429 = 0.0
+
+    def do_GET(self):
+        host, _, rest = self.path.lstrip("/").partition("/")
+        _, key = record_key(f"https://{host}/{rest}")
+        base = os.path.join(self.record_dir, host, key)
+
+        delay = self.latency + random.uniform(0, self.jitter)
+        if delay:
+            time.sleep(delay)
+
+        roll = random.random()
+        if roll < self.rate_429:
+            self.send_error_status(429, {"Retry-After": "1"})
+            return
+        if roll < self.rate_429 + self.error_rate:
+            self.send_error_status(503)
+            return
+
+        if not os.path.exists(base + ".json"):
+            self.send_error_status(404)
+            return
+
+        with open(base + ".json", "r", encoding="utf-8") as f:
+            meta = json.load(f)
+
+        # Header names are case-insensitive, and older recordings kept the origin's casing
+        headers = {name.lower(): value for name, value in meta["headers"].items()}
+        etag = headers.get("etag")
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        with open(base + ".body", "rb") as f:
+            body = f.read()
+
+        self.send_response(meta["status"])
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_error_status(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+def serve(record_dir, port=DEFAULT_PORT, latency_ms=0, jitter_ms=0, error_rate=0.0, rate_429=0.0):
+    ReplayHandler.record_dir = record_dir
+    ReplayHandler.latency = latency_ms / 1000
+    ReplayHandler.jitter = jitter_ms / 1000
+    ReplayHandler.error_rate = error_rate
+    ReplayHandler.rate_429 = rate_429
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+    print(f"🔁 Replaying {record_dir} on http://127.0.0.1:{port} "
+          f"(latency {latency_ms}ms ±{jitter_ms}ms, errors {error_rate:.0%}, 429s {rate_429:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded MLB API responses.")
+    parser.add_argument("--dir", default="recordings", help="directory written via MLB_RECORD_DIR")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency", type=float, default=0, help="added latency per request (ms)")
+    parser.add_argument("--jitter", type=float, default=0, help="extra random latency (ms)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    serve(args.dir, args.port, args.latency, args.jitter, args.error_rate, args.rate_429)
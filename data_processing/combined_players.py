@@ -1,14 +1,47 @@
+import os
 import json
-import unicodedata
-import re
+from util.names import normalize_name, clean_name, card_name_key, player_name_key
+from data_processing.fuzzy_match import FuzzyCardMatcher
+from data_processing.roster_slotting import slot_roster
 
-with open('jsons/mlb_players.json', 'r') as f:
-    player_data = json.load(f)
+PLAYERS_PATH = 'jsons/mlb_players.json'
+CARDS_PATH = 'jsons/mlb_cards.json'
+CARD_INDEX_PATH = 'jsons/mlb_cards.index.json'
+OUTPUT_PATH = 'jsons/combined_players.json'
 
 def load_mlb_cards():
-    with open('jsons/mlb_cards.json', 'r') as f:
+    with open(CARDS_PATH, 'r') as f:
         return json.load(f)
 
+def build_card_index(cards):
+    """Map "first|last" (normalized) to the position of the first card with that name."""
+    index = {}
+    for i, card in enumerate(cards):
+        first, last = card_name_key(card.get("name", ""))
+        index.setdefault(f"{first}|{last}", i)
+    return index
+
+def card_index_from_keys(cards, index):
+    """Turn a saved "first|last" -> position index into {(first, last): card}."""
+    return {tuple(key.split("|", 1)): cards[i] for key, i in index.items()}
+
+def load_card_index(cards):
+    """{(first, last): card}, reusing the index saved beside mlb_cards.json while it is current."""
+    stat = os.stat(CARDS_PATH)
+    index = None
+    if os.path.exists(CARD_INDEX_PATH):
+        with open(CARD_INDEX_PATH, 'r') as f:
+            saved = json.load(f)
+        if saved["source_mtime"] == stat.st_mtime and saved["source_size"] == stat.st_size:
+            index = saved["keys"]
+
+    if index is None:
+        index = build_card_index(cards)
+        with open(CARD_INDEX_PATH, 'w') as f:
+            json.dump({"source_mtime": stat.st_mtime, "source_size": stat.st_size, "keys": index}, f)
+
+    return card_index_from_keys(cards, index)
+
 def normalize_height(height_str):
     """Convert height string to total inches as integer"""
     if not height_str:
@@ -19,27 +52,6 @@ def normalize_height(height_str):
     except:
         return 0
 
-def normalize_name(name):
-    """Convert name to ASCII and remove special characters (only a-z)"""
-    if not name:
-        return ""
-    # Normalize unicode and remove accents
-    normalized = unicodedata.normalize('NFKD', name)
-    ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
-    # Keep only alphabetic characters (remove spaces, punctuation, etc.)
-    return ''.join(c for c in ascii_name if c.isalpha()).lower()
-
-def clean_name(name):
-    """Convert name to ASCII, keep only letters, apostrophes, and periods"""
-    if not name:
-        return ""
-    # Normalize unicode (remove accents/diacritics)
-    normalized = unicodedata.normalize('NFKD', name)
-    ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
-    # Allow A–Z, a–z, apostrophe, and period
-    cleaned = re.sub(r"[^a-zA-Z'.]", "", ascii_name)
-    return cleaned
-
 def name_contains_match(player_name, card_name):
     player_words = [normalize_name(word) for word in player_name.split()]
     card_words = [normalize_name(word) for word in card_name.split()]
@@ -49,31 +61,11 @@ def name_contains_match(player_name, card_name):
                for p_word in player_words 
                for c_word in card_words)
 
-def match_card_by_attributes(player, cards):
-    # Player values
-    player_first_name = normalize_name(player.get("firstName", ""))
-    player_last_name = normalize_name(player.get("lastName", ""))
-
-    for card in cards:
-        try:
-            card_name_parts = card.get("name", "").split()
-            card_first_name = normalize_name(card_name_parts[0]) if card_name_parts else ""
-            card_last_name = normalize_name(" ".join(card_name_parts[1:])) if len(card_name_parts) > 1 else ""
-
-            if player_first_name == card_first_name and player_last_name == card_last_name:
-                print(f"Match found: {player.get('firstName')} {player.get('lastName')}")
-                return card
-
-        except Exception as e:
-            print(f"Error processing card: {e}")
-            continue
-
-    return None
-
-mlb_cards = load_mlb_cards()
-enhanced_data = {}
-
-print("\n--- Players with no match found ---\n")
+def match_card_by_attributes(player, card_index):
+    card = card_index.get(player_name_key(player))
+    if card is not None:
+        print(f"Match found: {player.get('firstName')} {player.get('lastName')}")
+    return card
 
 # Define the exact position order we want
 POSITION_ORDER = [
@@ -91,96 +83,65 @@ POSITION_ORDER = [
     ("BENCH", 4)   # 4 highest OVR remaining players
 ]
 
-for team, players in player_data.items():
-    enhanced_players = []
-    for player in players:
-        matched_card = match_card_by_attributes(player, mlb_cards)
-        if matched_card is None:
-            print(f"No match for: {player['firstName']} {player['lastName']} | Team: {team} | Age: {player.get('currentAge')} | Height: {player.get('height')}")
-        player["mlbCard"] = matched_card
-
-        player["firstName"] = clean_name(player.get("firstName", ""))
-        player["lastName"] = clean_name(player.get("lastName", ""))
-
-        enhanced_players.append(player)
-    
-    # Separate players by position
-    position_groups = {}
-    for player in enhanced_players:
-        if player["mlbCard"]:
-            pos = player["mlbCard"].get("display_position", "")
-            if pos not in position_groups:
-                position_groups[pos] = []
-            position_groups[pos].append(player)
-        else:
-            if "UNKNOWN" not in position_groups:
-                position_groups["UNKNOWN"] = []
-            position_groups["UNKNOWN"].append(player)
+def combine_players(player_data, mlb_cards, card_index=None):
+    """Attach each player's card and order every team by POSITION_ORDER slots.
+
+    Takes and returns {team: [player, ...]}; players are updated in place.
+    """
+    if card_index is None:
+        card_index = card_index_from_keys(mlb_cards, build_card_index(mlb_cards))
+    fuzzy_matcher = FuzzyCardMatcher(mlb_cards)
+    enhanced_data = {}
+
+    # Exact matches first, so a fuzzy match can't take a card another player's exact name claims
+    for players in player_data.values():
+        for player in players:
+            player["mlbCard"] = match_card_by_attributes(player, card_index)
+    used_cards = {id(player["mlbCard"]) for players in player_data.values()
+                  for player in players if player["mlbCard"] is not None}
+
+    print("\n--- Players with no match found ---\n")
+
+    for team, players in player_data.items():
+        enhanced_players = []
+        for player in players:
+            if player["mlbCard"] is None:
+                # Suffixes, nicknames, hyphens and accents the exact key can't bridge
+                matched_card = fuzzy_matcher.match(player, used_cards)
+                if matched_card is not None:
+                    used_cards.add(id(matched_card))
+                    print(f"Fuzzy match: {player['firstName']} {player['lastName']} -> {matched_card['name']}")
+                else:
+                    print(f"No match for: {player['firstName']} {player['lastName']} | Team: {team} | Age: {player.get('currentAge')} | Height: {player.get('height')}")
+                player["mlbCard"] = matched_card
+
+            player["firstName"] = clean_name(player.get("firstName", ""))
+            player["lastName"] = clean_name(player.get("lastName", ""))
+
+            enhanced_players.append(player)
     
-    # Sort each position group by OVR (descending)
-    for pos in position_groups:
-        position_groups[pos].sort(
-            key=lambda x: x["mlbCard"].get("ovr", 0) if x["mlbCard"] else 0,
-            reverse=True
-        )
-    
-    # Build the roster according to specified position order
-    final_roster = []
-    remaining_players = []
-    
-    for pos, count in POSITION_ORDER:
-        if pos == "BENCH":
-            # For bench, take highest OVR remaining players
-            candidates = []
-            for p in enhanced_players:
-                if p not in final_roster:
-                    candidates.append(p)
-            # Sort candidates by OVR
-            candidates.sort(
-                key=lambda x: x["mlbCard"].get("ovr", 0) if x["mlbCard"] else 0,
-                reverse=True
-            )
-            final_roster.extend(candidates[:count])
-        else:
-            # For specific positions
-            collected = 0
-            # First try exact position matches
-            if pos in position_groups:
-                for player in position_groups[pos]:
-                    if collected >= count:
-                        break
-                    if player not in final_roster:
-                        final_roster.append(player)
-                        collected += 1
-            
-            # If we still need more, look for players who can play this position
-            # (This would require additional position data in your cards)
-            # For now, we'll just take the next highest OVR players if we don't have enough
-            if collected < count:
-                candidates = []
-                for p in enhanced_players:
-                    if p not in final_roster:
-                        candidates.append(p)
-                # Sort candidates by OVR
-                candidates.sort(
-                    key=lambda x: x["mlbCard"].get("ovr", 0) if x["mlbCard"] else 0,
-                    reverse=True
-                )
-                final_roster.extend(candidates[:count - collected])
-    
-    # Tag remaining players with "AAA"
-    for player in enhanced_players:
-        if player not in final_roster:
-            player["league"] = "AAA"
-        else:
+        final_roster, aaa_players = slot_roster(enhanced_players, POSITION_ORDER)
+
+        # Tag remaining players with "AAA"
+        for player in final_roster:
             player.pop("league", None)  # Remove AAA tag if it exists
+        for player in aaa_players:
+            player["league"] = "AAA"
+
+        # Add remaining AAA players to the end
+        final_roster.extend(aaa_players)
     
-    # Add remaining AAA players to the end
-    aaa_players = [p for p in enhanced_players if p.get("league") == "AAA"]
-    final_roster.extend(aaa_players)
-    
-    enhanced_data[team] = final_roster
+        enhanced_data[team] = final_roster
+
+    return enhanced_data
+
+if __name__ == "__main__":
+    with open(PLAYERS_PATH, 'r') as f:
+        player_data = json.load(f)
+    mlb_cards = load_mlb_cards()
+
+    enhanced_data = combine_players(player_data, mlb_cards, load_card_index(mlb_cards))
 
-# Save output
-with open('jsons/combined_players.json', 'w') as f:
-    json.dump(enhanced_data, f, indent=2)
\ No newline at end of file
+    # Save output
+    with open(OUTPUT_PATH, 'w') as f:
+        json.dump(enhanced_data, f, indent=2)
@@ -0,0 +1,156 @@
+import unicodedata
+from collections import defaultdict
+from util.names import normalize_name
+
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+# Common short forms, normalized -> the formal name used on the other source
+NICKNAMES = {
+    "alex": "alexander", "andy": "andrew", "ben": "benjamin", "cam": "cameron",
+    "chris": "christopher", "dan": "daniel", "danny": "daniel", "dave": "david",
+    "greg": "gregory", "jake": "jacob", "jeff": "jeffrey", "jon": "jonathan",
+    "joe": "joseph", "josh": "joshua", "ken": "kenneth", "matt": "matthew",
+    "mike": "michael", "nate": "nathan", "nick": "nicholas", "rob": "robert",
+    "bobby": "robert", "sam": "samuel", "tom": "thomas", "tony": "anthony",
+    "will": "william", "zach": "zachary", "zack": "zachary",
+}
+
+# Name similarity weights, used to rank candidates that pass the name checks
+FIRST_NAME_WEIGHT = 0.4
+LAST_NAME_WEIGHT = 0.5
+# Age and handedness only separate candidates whose names agree equally well
+AGE_BONUS, AGE_PENALTY = 0.1, 0.15
+HAND_BONUS, HAND_PENALTY = 0.05, 0.1
+# Similarity the surname and (when not equal, an initial or a prefix) the first name need
+MIN_LAST_SIMILARITY = 0.8
+MIN_FIRST_SIMILARITY = 0.75
+# A match is rejected when the runner-up scores this close to the best candidate
+AMBIGUITY_MARGIN = 0.05
+
+def name_tokens(name):
+    """Normalized words of a name, hyphens split, Jr./II-style suffixes dropped."""
+    ascii_name = unicodedata.normalize('NFKD', name or "").replace("-", " ")
+    tokens = [normalize_name(word) for word in ascii_name.split()]
+    return [t for t in tokens if t and t not in NAME_SUFFIXES]
+
+def soundex(word):
+    """American Soundex code, e.g. "Robert" -> "R163"."""
+    if not word:
+        return ""
+    codes = {c: str(d) for d, letters in enumerate(
+        ["aeiouyhw", "bfpv", "cgjkqsxz", "dt", "l", "mn", "r"]) for c in letters}
+    result = word[0].upper()
+    previous = codes.get(word[0], "")
+    for c in word[1:]:
+        code = codes.get(c, "")
+        if code and code != "0" and code != previous:
+            result += code
+        if c not in "hw":
+            previous = code
+    return (result + "000")[:4]
+
+def edit_distance(a, b):
+    """Levenshtein distance between two short strings."""
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+def similarity(a, b):
+    if not a or not b:
+        return 0.0
+    return 1 - edit_distance(a, b) / max(len(a), len(b))
+
+def block_keys(last_tokens):
+    """Blocking keys for a surname: the whole surname, each part of a compound one, and its Soundex."""
+    if not last_tokens:
+        return set()
+    joined = "".join(last_tokens)
+    return {joined, soundex(joined), *last_tokens}
+
+def hands_agree(player_hand, card_hand):
+    """None if either side is unknown; switch hitters ("S") match either side."""
+    if not player_hand or not card_hand:
+        return None
+    return player_hand == card_hand or "S" in (player_hand, card_hand)
+
+def first_names_agree(first, card_first):
+    """Equal after nicknames, one an initial or prefix of the other, or similar enough on their own."""
+    if not first or not card_first:
+        return False
+    first = NICKNAMES.get(first, first)
+    card_first = NICKNAMES.get(card_first, card_first)
+    if first.startswith(card_first) or card_first.startswith(first):
+        return True
+    return similarity(first, card_first) >= MIN_FIRST_SIMILARITY
+
+class FuzzyCardMatcher:
+    """Fallback matcher for players whose exact normalized name has no card.
+
+    Cards are blocked by surname keys, so each player is only scored against
+    the handful of cards sharing a key. That keeps the pass near-linear.
+    """
+
+    def __init__(self, cards):
+        self.blocks = defaultdict(list)
+        for card in cards:
+            tokens = name_tokens(card.get("name"))
+            entry = (card, tokens[:1], tokens[1:])
+            for key in block_keys(tokens[1:]):
+                self.blocks[key].append(entry)
+
+    def attribute_score(self, player, card):
+        """Age and handedness agreement, from -0.35 to +0.2."""
+        score = 0.0
+        if player.get("age") and card.get("age"):
+            score += AGE_BONUS if abs(player["age"] - card["age"]) <= 1 else -AGE_PENALTY
+
+        for player_hand, card_hand in ((player.get("throw_hand"), card.get("throw_hand")),
+                                       (player.get("bat_side"), card.get("bat_hand"))):
+            agree = hands_agree(player_hand, card_hand)
+            if agree is not None:
+                score += HAND_BONUS if agree else -HAND_PENALTY
+        return score
+
+    def score(self, player, first, last, card, card_first, card_last):
+        """Name similarity plus attribute agreement, or None if the names don't agree on their own."""
+        last_similarity = similarity(last, card_last)
+        if last_similarity < MIN_LAST_SIMILARITY or not first_names_agree(first, card_first):
+            return None
+        first = NICKNAMES.get(first, first)
+        card_first = NICKNAMES.get(card_first, card_first)
+        return (FIRST_NAME_WEIGHT * similarity(first, card_first)
+                + LAST_NAME_WEIGHT * last_similarity
+                + self.attribute_score(player, card))
+
+    def match(self, player, used=()):
+        """Best card for a player, or None if no card's names agree or the top two are too close.
+
+        Cards whose id() is in used (already given to another player) are skipped.
+        """
+        first_tokens = name_tokens(player.get("firstName"))
+        last_tokens = name_tokens(player.get("lastName"))
+        first, last = "".join(first_tokens[:1]), "".join(last_tokens)
+
+        # seen only de-duplicates cards that sit in several of this player's blocks
+        scored, seen = [], set()
+        for key in block_keys(last_tokens):
+            for card, card_first, card_last in self.blocks.get(key, ()):
+                if id(card) in seen or id(card) in used:
+                    continue
+                seen.add(id(card))
+                score = self.score(player, first, last, card, "".join(card_first), "".join(card_last))
+                if score is not None:
+                    scored.append((score, card))
+
+        if not scored:
+            return None
+        scored.sort(key=lambda entry: entry[0], reverse=True)
+        if len(scored) > 1 and scored[0][0] - scored[1][0] < AMBIGUITY_MARGIN:
+            return None
+        return scored[0][1]
@@ -0,0 +1,183 @@
+from functools import lru_cache
+import numpy as np
+from data_processing.combined_players import POSITION_ORDER
+from data_processing.roster_slotting import eligible_positions
+from util.roster_schema import (
+    POSITION_MAP, TEAM_LINEUP_OFFSET, TEAM_LINEUP_SIZE, LINEUP_SIZE, LINEUP_BATTERS,
+)
+
+# Each TEAM_LINEUP block starts with five 19-byte lineups (sizes in util/roster_schema.py):
+# nine batters (indices into the team's player list, 0xFF for the pitcher's spot), nine
+# position codes (POSITION_MAP, 9 = DH, 0 for the pitcher's spot) and one flag byte we leave alone.
+# The 4-byte player list after them holds pitchers at 0-29 and hitters from 30,
+# in the order combined_players slots them.
+PITCHER_SPOT = 0xFF
+DH_CODE = 9
+HITTER_LIST_START = 0x1E
+
+# (opposing starter's hand, DH) for each lineup in the block; the fifth mirrors
+# the second in every default team
+LINEUP_KINDS = [("R", True), ("R", False), ("L", True), ("L", False), ("R", False)]
+
+PITCHER_SLOTS = sum(count for pos, count in POSITION_ORDER if pos in ("SP", "RP", "CP"))
+HITTER_SLOTS = sum(count for pos, count in POSITION_ORDER) - PITCHER_SLOTS
+MAX_TEAMS = 30
+
+FIELD_POSITIONS = ["C", "1B", "2B", "3B", "SS", "LF", "CF", "RF"]
+GROUP_POSITIONS = {"IF": {"1B", "2B", "3B", "SS"}, "OF": {"LF", "CF", "RF"}}
+
+# How much glove counts at each position (DH is bat only)
+DEFENSE_WEIGHT = {"C": 1.0, "SS": 1.0, "CF": 0.9, "2B": 0.8, "3B": 0.7, "RF": 0.6, "LF": 0.5, "1B": 0.4, "DH": 0.0}
+INELIGIBLE_PENALTY = 100.0
+
+# Batting features: contact, power, plate vision, plate discipline, speed
+SLOT_WEIGHTS = np.array([
+    [0.30, 0.05, 0.25, 0.25, 0.15],
+    [0.35, 0.20, 0.20, 0.15, 0.10],
+    [0.30, 0.40, 0.15, 0.15, 0.00],
+    [0.20, 0.60, 0.10, 0.10, 0.00],
+    [0.25, 0.45, 0.15, 0.15, 0.00],
+    [0.30, 0.30, 0.20, 0.20, 0.00],
+    [0.30, 0.30, 0.20, 0.20, 0.00],
+    [0.30, 0.30, 0.20, 0.20, 0.00],
+    [0.30, 0.20, 0.20, 0.20, 0.10],
+])
+# Earlier spots come up more often over a season
+SLOT_WEIGHTS *= np.linspace(1.0, 0.84, LINEUP_BATTERS)[:, None]
+
+def hitter_features(card, hand):
+    """(contact, power, vision, discipline, speed) against a pitcher throwing `hand`."""
+    side = "left" if hand == "L" else "right"
+    fields = [f"contact_{side}", f"power_{side}", "plate_vision", "plate_discipline", "speed"]
+    return [card.get(field, 50) for field in fields]
+
+def defense_rating(card, position):
+    if position == "DH":
+        return 0
+    range_field = "blocking" if position == "C" else "reaction_time"
+    return 0.5 * card.get("fielding_ability", 50) + 0.25 * card.get("arm_strength", 50) + 0.25 * card.get(range_field, 50)
+
+def playable_positions(player):
+    positions = set()
+    for position in eligible_positions(player):
+        positions |= GROUP_POSITIONS.get(position, {position})
+    return positions | {"DH"}
+
+@lru_cache(maxsize=None)
+def mask_tables(n):
+    """For every subset mask of n items: the mask with each item removed, which
+    items it contains, and its size."""
+    masks = np.arange(1 << n)
+    bits = 1 << np.arange(n)
+    contains = (masks[:, None] & bits) != 0
+    return masks[:, None] ^ bits, contains, contains.sum(axis=1)
+
+def assign_defense(hitters, features, positions):
+    """Pick one hitter per position maximizing bat plus weighted glove.
+
+    Bitmask DP over the set of filled positions: each hitter either sits or
+    takes one open position, so only 2^len(positions) states are kept per
+    hitter instead of enumerating permutations. Returns {position: hitter}.
+    """
+    offense = features[:, :4].mean(axis=1)
+    score = np.empty((len(hitters), len(positions)))
+    for i, player in enumerate(hitters):
+        card = player.get("mlbCard") or {}
+        playable = playable_positions(player)
+        for p, position in enumerate(positions):
+            score[i, p] = offense[i] + DEFENSE_WEIGHT[position] * defense_rating(card, position)
+            if position not in playable:
+                score[i, p] -= INELIGIBLE_PENALTY
+
+    without, contains, _ = mask_tables(len(positions))
+    best = np.full(len(without), -np.inf)
+    best[0] = 0
+    choices = []
+    for i in range(len(hitters)):
+        # Hitter i takes position p of mask (from mask without p), or sits
+        candidate = np.where(contains, best[without] + score[i], -np.inf)
+        p = candidate.argmax(axis=1)
+        take = candidate[np.arange(len(best)), p]
+        choices.append(np.where(take > best, p, -1))
+        best = np.maximum(best, take)
+
+    assignment = {}
+    mask = len(best) - 1
+    for i in reversed(range(len(hitters))):
+        p = choices[i][mask]
+        if p >= 0:
+            assignment[positions[p]] = i
+            mask ^= 1 << p
+    return assignment
+
+def order_batters(features):
+    """Batting order maximizing the summed slot scores, by DP over which batters are placed.
+
+    Slots are filled top-down, so a mask's size is the slot its last batter
+    took; each layer of masks is evaluated at once. Returns row indices of features.
+    """
+    n = len(features)
+    score = features @ SLOT_WEIGHTS[:n].T  # (batter, slot)
+    without, contains, size = mask_tables(n)
+    best = np.full(len(without), -np.inf)
+    best[0] = 0
+    last = np.full(len(without), -1)
+
+    for slot in range(n):
+        layer = np.flatnonzero(size == slot + 1)
+        candidate = np.where(contains[layer], best[without[layer]] + score[:, slot], -np.inf)
+        last[layer] = candidate.argmax(axis=1)
+        best[layer] = candidate.max(axis=1)
+
+    order = []
+    mask = len(best) - 1
+    while mask:
+        b = last[mask]
+        order.append(b)
+        mask ^= 1 << b
+    return order[::-1]
+
+def build_lineup(hitters, hand, dh):
+    """(batters, positions) bytes for one lineup, or None if the team is short of hitters."""
+    positions = FIELD_POSITIONS + (["DH"] if dh else [])
+    if len(hitters) < len(positions):
+        return None
+
+    features = np.array([hitter_features(player.get("mlbCard") or {}, hand) for player in hitters], dtype=float)
+    defense = assign_defense(hitters, features, positions)
+    starters = list(defense.values())
+    starter_position = {i: position for position, i in defense.items()}
+    order = [starters[k] for k in order_batters(features[starters])]
+
+    batters = [HITTER_LIST_START + i for i in order]
+    codes = [DH_CODE if starter_position[i] == "DH" else POSITION_MAP[starter_position[i]] for i in order]
+    if not dh:
+        batters.append(PITCHER_SPOT)
+        codes.append(0)
+    return bytes(batters), bytes(codes)
+
+def team_hitters(players):
+    """The active position players, in the order they sit in the team's player list."""
+    active = [player for player in players if player.get("league") != "AAA"]
+    return active[PITCHER_SLOTS:PITCHER_SLOTS + HITTER_SLOTS]
+
+def write_lineups(roster_data, data):
+    """Write every lineup for the first MAX_TEAMS teams into data. Returns the number of teams written."""
+    written = 0
+    for team_index, (team, players) in enumerate(list(roster_data.items())[:MAX_TEAMS]):
+        hitters = team_hitters(players)
+        built = {kind: build_lineup(hitters, *kind) for kind in set(LINEUP_KINDS)}
+        lineups = [built[kind] for kind in LINEUP_KINDS]
+        if None in lineups:
+            print(f"⚠️ {team}: only {len(hitters)} active hitters, keeping the template lineups")
+            continue
+
+        block = TEAM_LINEUP_OFFSET + team_index * TEAM_LINEUP_SIZE
+        for k, (batters, codes) in enumerate(lineups):
+            start = block + k * LINEUP_SIZE
+            data[start:start + LINEUP_BATTERS] = batters
+            data[start + LINEUP_BATTERS:start + 2 * LINEUP_BATTERS] = codes
+        written += 1
+
+    print(f"⚾ Wrote lineups for {written} teams")
+    return written
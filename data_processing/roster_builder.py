@@ -1,65 +1,29 @@
+import argparse
+import hashlib
 import json
-import re
+import mmap
+import os
+import shutil
+import numpy as np
+from data_processing.lineup_generator import MAX_TEAMS, write_lineups
+from util.roster_patch import create_patch_file
+from util.roster_schema import (
+    PROFILE, APPEARANCE, ATTRIBUTES, PITCHER, TEAM_LINEUP_OFFSET, TEAM_LINEUP_SIZE,
+    POSITION_MAP, PITCH_MAP, PITCHER_ROLE_MAP, get_handedness,
+    FEATURE_BYTES, DEFAULT_FEATURE_BYTES, RATING_FIELDS, PITCHER_ATT_FIELDS, MAX_PITCHES,
+)
 
 # json_file = 'jsons/combined_players.json'
-json_file = '../../../Courses/MachineLearning/final-project/mlb_players_with_appearance.json'
+json_file = 'jsons/mlb_players_with_appearance.json'
 hex_file = 'rosters/default_roster.mlb'
 output_file = 'roster.mlb'
 
-# Constants
-FIRST_PROFILE_OFFSET = 0x1CA90
-PLAYER_PROFILE_SIZE = 91
-PLAYER_APP_OFFSET = 0x0003AFDB
-PLAYER_APP_SIZE = 19
-PLAYER_ATTS_OFFSET = 0x0004153E
-PLAYER_ATTS_SIZE = 38
-TEAM_LINEUP_OFFSET = 0x00011A91
-TEAM_LINEUP_SIZE = 423
-PLAYER_PITCHER_OFFSET = 0x0004DFF0
-PLAYER_PITCHER_SIZE = 32
-
-POSITION_MAP = {
-    "P": 0, "C": 1, "1B": 2, "2B": 3, "3B": 4, "SS": 5,
-    "LF": 6, "CF": 7, "RF": 8
-}
-
-PITCH_MAP = {
-    "4-Seam Fastball": 0x00,
-    "Sinker": 0x01,
-    "Curveball": 0x02,
-    "Slider": 0x03,
-    "Slurve": 0x04,
-    "Splitter": 0x05,
-    "Changeup": 0x06,
-    "Knuckleball": 0x07,
-    "2-Seam Fastball": 0x08,
-    "Cutter": 0x09,
-    # "Circle-Change": 0x0A,
-    # "Palmball": 0x0B,
-    # "Forkball": 0x0C,
-    # "Knuckle-Curve": 0x0D,
-    # "Screwball": 0x0E,
-    # "12-6 Curve": 0x0F,
-    # "Sweeping Curve": 0x10,
-    # "Running Fastball": 0x11,
-    "NONE": 0xFF,
-}
-
-PITCHER_ROLE_MAP = {
-    "SP": 0, "RP": 1, "CP": 2
-}
-
-def get_handedness(throw, bat):
-    if throw == "L":
-        if bat == "L":
-            return 0x11
-        else:
-            return 0x01
-    else:
-        if bat == "R":
-            return 0x00
-        else:
-            return 0x10
+# Maximum expected players (30 teams × 40 players)
+MAX_PLAYERS = 1200
+
+# Per-player hashes of the last build, kept beside the output as <output>.manifest.json.
+# Bump the version whenever encode_players changes what it writes.
+MANIFEST_VERSION = 1
 
 def height_to_inches(height_str):
     """Convert height string in format "X' Y\"" to inches (e.g., "6' 3\"" -> 75)"""
@@ -72,252 +36,259 @@ def height_to_inches(height_str):
         # Return default height (5'10") if parsing fails
         return 70
 
-def to_hex(value):
-    if not isinstance(value, int):
-        raise ValueError("Input must be an integer.")
-    return hex(value)
-
 def pad_string(s, length):
     """Pad string with null bytes to exact length"""
     return s.encode('ascii', 'ignore')[:length].ljust(length, b'\x00')
 
-def inject_profiles():
-    with open(json_file, 'r') as f:
-        roster_data = json.load(f)
-
-    with open(hex_file, 'rb') as f:
-        data = bytearray(f.read())
-
-    current_profile_offset = FIRST_PROFILE_OFFSET
-    current_app_offset = PLAYER_APP_OFFSET
-    current_atts_offset = PLAYER_ATTS_OFFSET
-    current_lineup_offset = TEAM_LINEUP_OFFSET
-    current_pitcher_offset = PLAYER_PITCHER_OFFSET
-    total_players = 0
+def clamp(values, low=0, high=255):
+    return np.clip(np.asarray(values, dtype=np.int64), low, high)
+
+def pitch_bytes(pitches):
+    """PITCHER_INFO: (pitch code, speed, movement, control) for up to MAX_PITCHES pitches."""
+    info = []
+    for k in range(MAX_PITCHES):
+        if k < len(pitches):
+            pitch = pitches[k]
+            info += [PITCH_MAP.get(pitch.get("name", ""), 0xFF), pitch.get("speed", 0),
+                     pitch.get("movement", 0), pitch.get("control", 0)]
+        else:
+            info += [0xFF, 0, 0, 0]
+    return info
+
+def pitcher_slots(players):
+    """Pitcher record index for each player (-1 if their card has no pitches).
+
+    Pitcher records are packed in roster order, so a player's slot moves
+    whenever an earlier player gains or loses pitches.
+    """
+    slots = []
+    count = 0
+    for player in players:
+        if (player.get("mlbCard") or {}).get("pitches"):
+            slots.append(count)
+            count += 1
+        else:
+            slots.append(-1)
+    return slots
+
+def encode_players(players, data, slots=None, pitcher_slot=None):
+    """Write players into the profile, appearance, attribute and pitcher sections of data.
+
+    Fields are gathered into columns in one pass over the players and then
+    assigned to writable NumPy views over data, clamped to their byte ranges.
+    slots is each player's record index (default: 0..n-1) and pitcher_slot
+    their pitcher record index or -1 (default: pitcher_slots(players)).
+    Returns the number of pitcher records written.
+    """
+    n = len(players)
+    slots = np.arange(n) if slots is None else np.asarray(slots, dtype=np.int64)
+    if pitcher_slot is None:
+        pitcher_slot = pitcher_slots(players)
+    cards = [player.get("mlbCard") or {} for player in players]
+    has_card = np.array([bool(card) for card in cards], dtype=bool)
+
+    # === Profile ===
+    profile = PROFILE.view(data)
+    profile["PLAYER_ID"][slots] = 0xFFFD  # Player ID for player faces
+    profile["FirstName"][slots] = [pad_string(p.get('firstName', ''), 16) for p in players]
+    profile["LastName"][slots] = [pad_string(p.get('lastName', ''), 16) for p in players]
+    profile["Weight"][slots] = clamp([p.get('weight', 300) - 100 for p in players])
+    profile["Height"][slots] = clamp([height_to_inches(p.get('height', "5' 10\"")) for p in players])
+    jersey = clamp([int(p.get('jersey_number', 0)) for p in players])
+    profile["JERSEY_NUM"][slots] = jersey
+    profile["ORIG_JERSEY_NUM"][slots] = jersey
+    profile["POSITION"][slots] = [POSITION_MAP.get(p.get('position', 'P'), 0) for p in players]
+
+    # Role and handedness only change for players with a card
+    roles = np.array([PITCHER_ROLE_MAP.get(c.get("display_position", "SP"), 0) for c in cards], dtype=np.uint8)
+    hands = np.array([get_handedness(c.get("throw_hand"), c.get("bat_hand")) for c in cards], dtype=np.uint8)
+    profile["PITCHER_ROLE"][slots] = np.where(has_card, roles, profile["PITCHER_ROLE"][slots])
+    profile["HANDEDNESS"][slots] = np.where(has_card, hands, profile["HANDEDNESS"][slots])
+
+    profile["SKIN_TONE"][slots] = clamp([p.get('SKIN_TONE', 1) for p in players])
+    profile["AGE"][slots] = clamp([p.get('age', 25) for p in players])
+    profile["ML_OPTIONS"][slots] = [0x06 if p.get("league") == "AAA" else 0x00 for p in players]
+    profile["MUG_INDEX"][slots] = 0
+    profile["SECONDARY_POS"][slots] = 0
+
+    # === Appearance ===
+    app = APPEARANCE.view(data)
+    app["FACETYPE"][slots] = 0
+    app["BODYTYPE"][slots] = 2  # Normal
+    app["BATSTANCE"][slots] = 0
+    app["BATSTYLE"][slots] = [0x2f, 0x0d]
+    features = []
+    for p in players:
+        appearance = p.get("PlayerAppearance", {})
+        key = (appearance.get("EyeColor", "").lower(), appearance.get("BeardType", ""))
+        features.append(FEATURE_BYTES.get(key, DEFAULT_FEATURE_BYTES))
+    app["FEATURE_DATA"][slots] = np.frombuffer(b"".join(features), dtype=np.uint8).reshape(n, 4)
+
+    # === Attributes ===
+    ratings = np.full((n, len(RATING_FIELDS)), 50, dtype=np.int64)
+    for i, card in enumerate(cards):
+        if card:
+            ratings[i] = [card.get(field, 50) for field in RATING_FIELDS]
+    ATTRIBUTES.view(data)["PLR_ATTRIBUTES"][slots] = clamp(ratings, 0, 99)
+
+    # === Pitcher Attributes ===
+    pitchers = [(slot, card) for slot, card in zip(pitcher_slot, cards) if slot >= 0]
+    if pitchers:
+        rows = [slot for slot, _ in pitchers]
+        pitcher = PITCHER.view(data)
+        pitcher["PITCHER_INFO"][rows] = clamp([pitch_bytes(card["pitches"]) for _, card in pitchers])
+        pitcher["PITCHER_ATTS"][rows] = clamp([[card.get(field, 50) for field in PITCHER_ATT_FIELDS] for _, card in pitchers])
+        pitcher["DATA"][rows] = 0
+        pitcher["GOTO_PITCH"][rows] = 0
+
+    return len(pitchers)
+
+def load_roster_data(roster_data=None):
+    if roster_data is None:
+        with open(json_file, 'r') as f:
+            roster_data = json.load(f)
+    return roster_data
+
+def inject_mapped(roster_data, players, template_path, output_path, pitcher_slot=None):
+    """Encode players and lineups straight into output_path through a writable memory map."""
+    if not (os.path.exists(output_path) and os.path.samefile(template_path, output_path)):
+        shutil.copyfile(template_path, output_path)
+
+    with open(output_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as data:
+        pitcher_count = encode_players(players, data, pitcher_slot=pitcher_slot)
+        write_lineups(roster_data, data)
+        data.flush()
+    return pitcher_count
+
+def player_hash(player):
+    """Hash of everything the encoder reads from a player (source fields, card, appearance)."""
+    return hashlib.sha1(json.dumps(player, sort_keys=True).encode('utf-8')).hexdigest()
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def manifest_path(output_path):
+    return output_path + ".manifest.json"
+
+def save_build_manifest(output_path, template_hash, hashes, pitcher_slot):
+    stat = os.stat(output_path)
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "template": template_hash,
+        "output_mtime": stat.st_mtime,
+        "output_size": stat.st_size,
+        "players": hashes,
+        "pitcher_slots": pitcher_slot,
+    }
+    with open(manifest_path(output_path), 'w') as f:
+        json.dump(manifest, f)
+
+def load_build_manifest(output_path, template_hash):
+    """The last build's manifest, or None if it is missing or the output or template changed since."""
+    path = manifest_path(output_path)
+    if not (os.path.exists(path) and os.path.exists(output_path)):
+        return None
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    stat = os.stat(output_path)
+    if (manifest.get("version") != MANIFEST_VERSION or manifest.get("template") != template_hash
+            or manifest.get("output_mtime") != stat.st_mtime or manifest.get("output_size") != stat.st_size):
+        return None
+    return manifest
+
+def rebuild_changed(roster_data, players, hashes, pitcher_slot, manifest, template_path, output_path):
+    """Re-encode only the players whose hash or pitcher slot changed since the last build.
+
+    Changed records are first reset from the template so the result matches a
+    full build; slots the roster no longer uses go back to the template too.
+    Lineups are cheap, so they are always regenerated from the template's blocks.
+    Returns the number of players re-encoded.
+    """
+    old_hashes = manifest["players"]
+    old_pitcher_slot = manifest["pitcher_slots"]
+    changed = [i for i in range(len(players))
+               if i >= len(old_hashes) or hashes[i] != old_hashes[i] or pitcher_slot[i] != old_pitcher_slot[i]]
+    unused = list(range(len(players), len(old_hashes)))
+    pitcher_count = max(pitcher_slot, default=-1) + 1
+    old_pitcher_count = max(old_pitcher_slot, default=-1) + 1
+
+    with open(template_path, 'rb') as t, mmap.mmap(t.fileno(), 0, access=mmap.ACCESS_READ) as template, \
+            open(output_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as data:
+        reset = changed + unused
+        for section in (PROFILE, APPEARANCE, ATTRIBUTES):
+            section.raw(data)[reset] = section.raw(template)[reset]
+        if old_pitcher_count > pitcher_count:
+            stale = slice(pitcher_count, old_pitcher_count)
+            PITCHER.raw(data)[stale] = PITCHER.raw(template)[stale]
+
+        if changed:
+            encode_players([players[i] for i in changed], data, changed, [pitcher_slot[i] for i in changed])
+
+        lineups = slice(TEAM_LINEUP_OFFSET, TEAM_LINEUP_OFFSET + MAX_TEAMS * TEAM_LINEUP_SIZE)
+        data[lineups] = template[lineups]
+        write_lineups(roster_data, data)
+        data.flush()
+
+    return len(changed)
+
+def inject_profiles(roster_data=None, template_path=hex_file, output_path=output_file, use_mmap=False,
+                    incremental=False):
+    """Write every player into a copy of the template roster.
+
+    roster_data is {team: [player, ...]}; it is read from json_file when omitted.
+    With use_mmap=True the template is copied to output_path (or used as-is when
+    they are the same file) and the records are patched in place through a
+    memory map, so only the touched pages are written back.
+    With incremental=True, and a manifest from a previous build of output_path
+    against the same template, only players whose data or pitcher slot changed
+    are re-encoded; every other record is left as it is.
+    """
+    roster_data = load_roster_data(roster_data)
+    players = [player for team in roster_data.values() for player in team][:MAX_PLAYERS]
+    hashes = [player_hash(player) for player in players]
+    pitcher_slot = pitcher_slots(players)
+
+    # Building over the template itself leaves nothing to compare against
+    in_place = os.path.exists(output_path) and os.path.samefile(template_path, output_path)
+    template_hash = None if in_place else file_hash(template_path)
+    manifest = load_build_manifest(output_path, template_hash) if incremental and not in_place else None
+    if incremental and manifest is None:
+        print("⚠️ No usable build manifest; rebuilding every player")
+
+    if manifest is not None:
+        changed = rebuild_changed(roster_data, players, hashes, pitcher_slot, manifest, template_path, output_path)
+        print(f"♻️ Re-encoded {changed} of {len(players)} player profiles ({len(players) - changed} unchanged)")
+    else:
+        if use_mmap:
+            pitcher_count = inject_mapped(roster_data, players, template_path, output_path, pitcher_slot)
+        else:
+            with open(template_path, 'rb') as f:
+                data = bytearray(f.read())
+            pitcher_count = encode_players(players, data, pitcher_slot=pitcher_slot)
+            write_lineups(roster_data, data)
+            with open(output_path, 'wb') as f:
+                f.write(data)
+        print(f"Injected {len(players)} player profiles ({pitcher_count} pitchers) starting at offset {hex(PROFILE.offset)}")
 
-    first_lineup = bytearray(data[TEAM_LINEUP_OFFSET:TEAM_LINEUP_OFFSET + TEAM_LINEUP_SIZE])
-
-    for team_name, players in roster_data.items():
-        for player in players:
-            # Stop if we've reached maximum expected players (30 teams × 40 players)
-            if total_players >= 1200:
-                break
-
-            mlb_card = player.get("mlbCard", {})
-            
-            profile = bytearray(data[current_profile_offset:current_profile_offset + PLAYER_PROFILE_SIZE])
-
-            # === Profile ===
-            # Player ID for player faces
-            profile[0x00:0x02] = bytes([0xfd, 0xff])
-
-            # First Name
-            profile[0x04:0x14] = pad_string(player.get('firstName', ''), 16)
-            profile[0x14:0x24] = pad_string(player.get('lastName', ''), 16)
-
-            # Weight (2 bytes - first byte is weight, second is 0x00)
-            weight = (player.get('weight', 300) - 100);
-            profile[0x24:0x26] = bytes([weight, 0x00])
-            
-            # Height (1 byte)
-            profile[0x26] = height_to_inches(player.get('height', "5' 10\""))
-
-            # Jersey Number (stored in two bytes)
-            jersey = int(player.get('jersey_number', 0))
-            profile[0x27] = jersey
-            profile[0x28] = jersey
-
-            # Position and role
-            position = player.get('position', 'P')
-            profile[0x29] = POSITION_MAP.get(position, 0)
-            if (mlb_card):
-                profile[0x2A] = PITCHER_ROLE_MAP.get(mlb_card.get("display_position", "SP"), 0)
-
-            # Skin Tone and Age
-            profile[0x2B] = player.get('SKIN_TONE', 1)
-            profile[0x2C] = player.get('age', 25)
-
-            # Handedness
-            # Throw, Bat Hand
-            # - 00 = Right, Right
-            # - 01 = Left, Right
-            # - 10 = Right, Left
-            # - 11 = Left, Left
-            if mlb_card:
-                profile[0x2D] = get_handedness(mlb_card.get("throw_hand"), mlb_card.get("bat_hand"))
-
-            # ML Options
-            if player.get("league") == "AAA":
-                profile[0x34] = 0x06
-            else:
-                profile[0x34] = 0x00
-
-            # DB Index
-            # profile[0x35:0x37] = bytes([0x00, 0x00])
-
-            # MUG Index
-            profile[0x37:0x39] = bytes([0x00, 0x00])
-
-            # DATA_BLOCK1
-            # profile[0x39] = 0x00
-
-            # DATA_BLOCK2
-            # profile[0x3A:0x3E] = bytes([0x00, 0x00, 0x00, 0x00])
-            # profile[0x3D] = 0x58
-
-            # DATA_BLOCK3
-            # profile[0x3E:0x42] = bytes([0x00, 0x00, 0x00, 0x00])
-
-            # Secondary Pos.
-            profile[0x42] = 0x00
-
-            # Write back to data
-            data[current_profile_offset:current_profile_offset + PLAYER_PROFILE_SIZE] = profile
-
-            # === Appearance ===
-            app = bytearray(data[current_app_offset:current_app_offset + PLAYER_APP_SIZE])
-
-            # Face Type
-            app[0x00] = 0
-
-            # Body Type, Normal=2
-            app[0x02] = 2
-
-            # Batting Stance
-            app[0x09] = 0
-
-            # Bat Style
-            app[0x0D:0x0F] = bytes([0x2f, 0x0d])
-
-            # Feature Data
-            appearance = player.get("PlayerAppearance", {})
-            eye_color = appearance.get("EyeColor", "").lower()
-            beard_type = appearance.get("BeardType", "")
-            feature_bytes = bytes([0x00, 0x00, 0x00, 0x00])  # default (clean shaven, brown eyes)
-
-            if eye_color == "brown" and beard_type == "full":
-                feature_bytes = bytes([0x11, 0x00, 0x00, 0x00])
-            elif eye_color == "blue" and beard_type == "full":
-                feature_bytes = bytes([0x10, 0x10, 0x00, 0x00])
-            elif eye_color == "brown" and beard_type == "goatee":
-                feature_bytes = bytes([0x00, 0x00, 0x08, 0x00])
-            elif eye_color == "blue" and beard_type == "goatee":
-                feature_bytes = bytes([0x00, 0x10, 0x08, 0x00])
-            elif eye_color == "brown" and beard_type == "stubble":
-                feature_bytes = bytes([0x08, 0x00, 0x00, 0x00])
-            elif eye_color == "blue" and beard_type == "stubble":
-                feature_bytes = bytes([0x08, 0x10, 0x00, 0x00])
-            elif eye_color == "brown" and beard_type == "mustache":
-                feature_bytes = bytes([0x00, 0x00, 0x01, 0x00])
-            elif eye_color == "blue" and beard_type == "mustache":
-                feature_bytes = bytes([0x01, 0x10, 0x01, 0x00])
-            elif eye_color == "brown" and beard_type == "none":
-                feature_bytes = bytes([0x01, 0x00, 0x00, 0x00])
-            elif eye_color == "blue" and beard_type == "none":
-                feature_bytes = bytes([0x01, 0x10, 0x00, 0x00])
-            
-            app[0x0F:0x13] = feature_bytes
-
-            data[current_app_offset:current_app_offset + PLAYER_APP_SIZE] = app
-
-            # === Attributes ===
-            atts = bytearray(data[current_atts_offset:current_atts_offset + PLAYER_ATTS_SIZE])
-
-            if (mlb_card):
-                player_ratings = [
-                    mlb_card.get("ovr", 50),
-                    min(mlb_card.get("contact_left", 50), 99),
-                    min(mlb_card.get("contact_right", 50), 99),
-                    min(mlb_card.get("power_left", 50), 99),
-                    min(mlb_card.get("power_right", 50), 99),
-                    min(mlb_card.get("batting_clutch", 50), 99),
-                    min(mlb_card.get("bunting_ability", 50), 99),
-                    min(mlb_card.get("drag_bunting_ability", 50), 99),
-                    min(mlb_card.get("plate_vision", 50), 99),
-                    min(mlb_card.get("plate_discipline", 50), 99),
-                    mlb_card.get("ovr", 50), # Player Potential
-                    min(mlb_card.get("hitting_durability", 50), 99),
-                    min(mlb_card.get("speed", 50), 99),
-                    min(mlb_card.get("baserunning_ability", 50), 99),
-                    min(mlb_card.get("baserunning_aggression", 50), 99),
-                    min(mlb_card.get("arm_strength", 50), 99),
-                    min(mlb_card.get("arm_accuracy", 50), 99),
-                    min(mlb_card.get("fielding_ability", 50), 99),
-                    min(mlb_card.get("reaction_time", 50), 99),
-                    min(mlb_card.get("blocking", 50), 99)
-                ]
-                print(player.get("firstName"), player.get("lastName"), player_ratings)
-
-                atts[0x03:0x17] = bytes(player_ratings)
-            else:
-                atts[0x03:0x17] = bytes([50] * 20)
-            
-            data[current_atts_offset:current_atts_offset + PLAYER_ATTS_SIZE] = atts
-
-            # === Pitcher Attributes ===
-            if mlb_card and len(mlb_card.get("pitches", [])) > 0:
-                pitcher = bytearray(data[current_pitcher_offset:current_pitcher_offset + PLAYER_PITCHER_SIZE])
-
-                pitches = [
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[0].get("name", ""), 0xFF),
-                    mlb_card.get("pitches", [])[0].get("speed", 0),
-                    mlb_card.get("pitches", [])[0].get("movement", 0),
-                    mlb_card.get("pitches", [])[0].get("control", 0),
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[1].get("name", ""), 0xFF) if len(mlb_card.get("pitches", [])) > 1 else 0xFF,
-                    mlb_card.get("pitches", [])[1].get("speed", 0) if len(mlb_card.get("pitches", [])) > 1 else 0,
-                    mlb_card.get("pitches", [])[1].get("movement", 0) if len(mlb_card.get("pitches", [])) > 1 else 0,
-                    mlb_card.get("pitches", [])[1].get("control", 0) if len(mlb_card.get("pitches", [])) > 1 else 0,
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[2].get("name", ""), 0xFF) if len(mlb_card.get("pitches", [])) > 2 else 0xFF,
-                    mlb_card.get("pitches", [])[2].get("speed", 0) if len(mlb_card.get("pitches", [])) > 2 else 0,
-                    mlb_card.get("pitches", [])[2].get("movement", 0) if len(mlb_card.get("pitches", [])) > 2 else 0,
-                    mlb_card.get("pitches", [])[2].get("control", 0) if len(mlb_card.get("pitches", [])) > 2 else 0,
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[3].get("name", ""), 0xFF) if len(mlb_card.get("pitches", [])) > 3 else 0xFF,
-                    mlb_card.get("pitches", [])[3].get("speed", 0) if len(mlb_card.get("pitches", [])) > 3 else 0,
-                    mlb_card.get("pitches", [])[3].get("movement", 0) if len(mlb_card.get("pitches", [])) > 3 else 0,
-                    mlb_card.get("pitches", [])[3].get("control", 0) if len(mlb_card.get("pitches", [])) > 3 else 0,
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[4].get("name", ""), 0xFF) if len(mlb_card.get("pitches", [])) > 4 else 0xFF,
-                    mlb_card.get("pitches", [])[4].get("speed", 0) if len(mlb_card.get("pitches", [])) > 4 else 0,
-                    mlb_card.get("pitches", [])[4].get("movement", 0) if len(mlb_card.get("pitches", [])) > 4 else 0,
-                    mlb_card.get("pitches", [])[4].get("control", 0) if len(mlb_card.get("pitches", [])) > 4 else 0,
-                    PITCH_MAP.get(mlb_card.get("pitches", [])[5].get("name", ""), 0xFF) if len(mlb_card.get("pitches", [])) > 5 else 0xFF,
-                    mlb_card.get("pitches", [])[5].get("speed", 0) if len(mlb_card.get("pitches", [])) > 5 else 0,
-                    mlb_card.get("pitches", [])[5].get("movement", 0) if len(mlb_card.get("pitches", [])) > 5 else 0,
-                    mlb_card.get("pitches", [])[5].get("control", 0) if len(mlb_card.get("pitches", [])) > 5 else 0,
-                ]
-
-                pitcher[0x00:0x18] = bytes(pitches)
-                pitcher[0x18] = mlb_card.get("stamina", 50)
-                pitcher[0x19] = mlb_card.get("pitching_clutch", 50)
-                pitcher[0x1A] = mlb_card.get("hits_per_bf", 50)
-                pitcher[0x1B] = mlb_card.get("hr_per_bf", 50)
-                pitcher[0x1C] = mlb_card.get("k_per_bf", 50)
-                pitcher[0x1D] = mlb_card.get("bb_per_bf", 50)
-                pitcher[0x1E] = 0x00
-                pitcher[0x1F] = 0x00
-
-                data[current_pitcher_offset:current_pitcher_offset + PLAYER_PITCHER_SIZE] = pitcher
-                current_pitcher_offset += PLAYER_PITCHER_SIZE
-
-            # Move to next player position
-            current_profile_offset += PLAYER_PROFILE_SIZE
-            current_app_offset += PLAYER_APP_SIZE
-            current_atts_offset += PLAYER_ATTS_SIZE
-            total_players += 1
-        
-        # === Lineup ===
-        # lineup = bytearray(data[current_lineup_offset:current_lineup_offset + TEAM_LINEUP_SIZE])
-        # lineup[0x00:0x09] = bytearray([0x1F, 0x26, 0x1E, 0x22, 0x21, 0x25, 0x23, 0x20, 0xFF])
-        # Correlates to position of players
-        # lineup[0x09:0x12] = bytearray([0x02, 0x07, 0x08, 0x06, 0x04, 0x03, 0x05, 0x01, 0x09])
-        #                               1B    CF     RF   LF    3B    2B    SS    C    P/DH
-        # data[current_lineup_offset:current_lineup_offset + TEAM_LINEUP_SIZE] = first_lineup
-        
-        current_lineup_offset += TEAM_LINEUP_SIZE
-
-    with open(output_file, 'wb') as f:
-        f.write(data)
-
-    print(f"Injected {total_players} player profiles starting at offset {hex(FIRST_PROFILE_OFFSET)}")
+    if not in_place:
+        save_build_manifest(output_path, template_hash, hashes, pitcher_slot)
 
 if __name__ == "__main__":
-    inject_profiles()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Write the combined players into a roster file.")
+    parser.add_argument("--template", default=hex_file)
+    parser.add_argument("--output", default=output_file)
+    parser.add_argument("--mmap", action="store_true",
+                        help="patch records in place through a memory map (pass the same path twice to edit a save directly)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="re-encode only players that changed since the last build of --output")
+    parser.add_argument("--patch", metavar="PATH",
+                        help="also write an IPS patch from the template to the built roster")
+    args = parser.parse_args()
+
+    if args.patch and os.path.exists(args.output) and os.path.samefile(args.template, args.output):
+        parser.error("--patch needs the template left untouched; use a different --output")
+    inject_profiles(template_path=args.template, output_path=args.output, use_mmap=args.mmap,
+                    incremental=args.incremental)
+    if args.patch:
+        create_patch_file(args.template, args.output, args.patch)
@@ -0,0 +1,102 @@
+import re
+from collections import defaultdict
+
+PITCHER_ROLES = {"SP", "RP", "CP"}
+
+def player_ovr(player):
+    card = player.get("mlbCard")
+    return card.get("ovr", 0) if card else 0
+
+def primary_position(player):
+    card = player.get("mlbCard")
+    return card.get("display_position", "") if card else "UNKNOWN"
+
+def eligible_positions(player):
+    """Positions a player can fill: primary, card secondaries, and any pitcher role for pitchers."""
+    card = player.get("mlbCard")
+    if not card:
+        return set()
+    positions = {card.get("display_position", "")}
+    secondary = card.get("display_secondary_positions") or ""
+    positions.update(p for p in re.split(r"[,/ ]+", secondary) if p)
+    if positions & PITCHER_ROLES:
+        positions |= PITCHER_ROLES
+    return positions
+
+def slot_roster(players, position_order):
+    """Fill the active roster slots and return (active, aaa) player lists.
+
+    position_order is a list of (position, count); "BENCH" takes the best
+    remaining players. Slots are filled in three passes: players whose primary
+    position matches (highest OVR first), then a maximum matching of open slots
+    to players eligible through secondary positions, then highest remaining
+    OVR for anything still open. Picked players are tracked by index, so the
+    whole pass is roughly linear in the number of players.
+    """
+    ovr = [player_ovr(p) for p in players]
+    by_ovr = sorted(range(len(players)), key=lambda i: -ovr[i])
+
+    groups = defaultdict(list)
+    for i in by_ovr:
+        groups[primary_position(players[i])].append(i)
+
+    picked = set()
+    slots = [[] for _ in position_order]
+
+    # Pass 1: exact primary position
+    for k, (pos, count) in enumerate(position_order):
+        if pos == "BENCH":
+            continue
+        for i in groups.get(pos, ()):
+            if len(slots[k]) >= count:
+                break
+            if i not in picked:
+                slots[k].append(i)
+                picked.add(i)
+
+    # Pass 2: assign open slots to secondary-eligible players. Trying players
+    # in OVR order with augmenting paths gives the matching that fills the
+    # most slots with the highest-rated players.
+    open_slots = [(k, n) for k, (pos, count) in enumerate(position_order)
+                  if pos != "BENCH" for n in range(count - len(slots[k]))]
+    open_positions = {position_order[k][0] for k, _ in open_slots}
+    slot_owner = {}
+
+    def assign(i, candidate_slots, visited):
+        for slot in candidate_slots[i]:
+            if slot in visited:
+                continue
+            visited.add(slot)
+            if slot not in slot_owner or assign(slot_owner[slot], candidate_slots, visited):
+                slot_owner[slot] = i
+                return True
+        return False
+
+    candidate_slots = {}
+    for i in by_ovr:
+        if i in picked:
+            continue
+        eligible = eligible_positions(players[i]) & open_positions
+        if eligible:
+            candidate_slots[i] = [s for s in open_slots if position_order[s[0]][0] in eligible]
+            assign(i, candidate_slots, set())
+
+    for (k, _), i in sorted(slot_owner.items()):
+        slots[k].append(i)
+        picked.add(i)
+
+    # Pass 3: highest OVR for whatever is still open, then the bench
+    remaining = (i for i in by_ovr if i not in picked)
+    fill_order = sorted(range(len(position_order)), key=lambda k: position_order[k][0] == "BENCH")
+    for k in fill_order:
+        count = position_order[k][1]
+        while len(slots[k]) < count:
+            i = next(remaining, None)
+            if i is None:
+                break
+            slots[k].append(i)
+            picked.add(i)
+
+    active = [players[i] for slot in slots for i in slot]
+    aaa = [p for i, p in enumerate(players) if i not in picked]
+    return active, aaa
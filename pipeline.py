@@ -0,0 +1,109 @@
+import argparse
+import json
+from util.player_store import save_rosters
+
+# Stages in run order. Each one takes and returns the in-memory rosters ({team: [player, ...]}).
+STAGES = ["rosters", "ethnicity", "cards", "combine", "appearance", "skin_tone", "build"]
+
+# Where a stage's rosters are written with --checkpoint (and read back by --start-at)
+ROSTER_CHECKPOINTS = {
+    "rosters": "jsons/mlb_players.json",
+    "ethnicity": "jsons/mlb_players.json",
+    "combine": "jsons/combined_players.json",
+    "appearance": "jsons/mlb_players_with_appearance.json",
+    "skin_tone": "jsons/mlb_players_with_appearance.json",
+}
+IMAGE_DIR = "mlb_headshots"
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_json(data, path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    print(f"💾 Checkpoint written to {path}")
+
+def load_rosters_before(stage):
+    """Rosters as left by the last checkpointed stage before `stage`."""
+    for previous in reversed(STAGES[:STAGES.index(stage)]):
+        if previous in ROSTER_CHECKPOINTS:
+            return load_json(ROSTER_CHECKPOINTS[previous])
+    return None
+
+def run_pipeline(start_at="rosters", stop_after="build", checkpoint=False, targeted_cards=False, resume=False):
+    """Run the stages from start_at through stop_after in one process.
+
+    Data is handed between stages in memory; JSON is only written when
+    checkpoint=True (plus roster.mlb from the build stage). The player store
+    (util/player_store.py) is refreshed after every stage.
+    """
+    stages = STAGES[STAGES.index(start_at):STAGES.index(stop_after) + 1]
+    rosters = load_rosters_before(start_at)
+    cards = None
+
+    if "combine" in stages and "cards" not in stages:
+        from data_collection.mlb_cards import CARDS_PATH
+        cards = load_json(CARDS_PATH)
+
+    for stage in stages:
+        print(f"\n▶️ Stage: {stage}")
+
+        if stage == "rosters":
+            from data_collection.mlb_api import build_all_rosters
+            rosters = build_all_rosters(resume=resume)
+
+        elif stage == "ethnicity":
+            from visual_analysis.ethnicity_analyzer import analyze_ethnicity, apply_ethnicity
+            apply_ethnicity(rosters, analyze_ethnicity(IMAGE_DIR))
+
+        elif stage == "cards":
+            from data_collection import mlb_cards
+            if targeted_cards:
+                cards = mlb_cards.fetch_rostered_cards(mlb_cards.attributes, rosters=rosters, save=checkpoint)
+            else:
+                cards = mlb_cards.fetch_all_mlb_cards(mlb_cards.attributes, refresh=True, save=checkpoint)
+            if cards is None:
+                raise RuntimeError("Card fetch failed")
+
+        elif stage == "combine":
+            from data_processing.combined_players import combine_players
+            rosters = combine_players(rosters, cards)
+
+        elif stage == "appearance":
+            from visual_analysis.classify_all import classify_players
+            classify_players(rosters)
+
+        elif stage == "skin_tone":
+            from visual_analysis.skin_tone_analyzer import apply_skin_tones
+            apply_skin_tones(rosters, IMAGE_DIR)
+
+        elif stage == "build":
+            from data_processing.roster_builder import inject_profiles
+            inject_profiles(rosters)
+
+        if rosters is not None:
+            save_rosters(rosters)
+        if checkpoint and stage in ROSTER_CHECKPOINTS:
+            save_json(rosters, ROSTER_CHECKPOINTS[stage])
+        if stage == "rosters":
+            # The fetch finished and is saved, so a later --resume must not reuse its teams
+            from data_collection.mlb_api import clear_checkpoints
+            clear_checkpoints()
+
+    return rosters
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build roster.mlb from the live APIs in one process.")
+    parser.add_argument("--start-at", choices=STAGES, default="rosters",
+                        help="skip earlier stages, loading their last checkpoint from jsons/")
+    parser.add_argument("--stop-after", choices=STAGES, default="build")
+    parser.add_argument("--checkpoint", action="store_true",
+                        help="write each stage's output to jsons/ as it finishes")
+    parser.add_argument("--targeted-cards", action="store_true",
+                        help="look up cards for rostered players only")
+    parser.add_argument("--resume", action="store_true",
+                        help="reuse teams checkpointed by a failed roster fetch")
+    args = parser.parse_args()
+
+    run_pipeline(args.start_at, args.stop_after, args.checkpoint, args.targeted_cards, args.resume)
@@ -0,0 +1,35 @@
+from data_processing.fuzzy_match import FuzzyCardMatcher
+
+def card(name, age=None, throw_hand=None, bat_hand=None):
+    return {"name": name, "age": age, "throw_hand": throw_hand, "bat_hand": bat_hand}
+
+def player(first, last, age=None, throw_hand=None, bat_side=None):
+    return {"firstName": first, "lastName": last, "age": age, "throw_hand": throw_hand, "bat_side": bat_side}
+
+def test_shared_surname_is_not_a_match():
+    matcher = FuzzyCardMatcher([card("Adolis Garcia", age=32, throw_hand="R", bat_hand="R")])
+    assert matcher.match(player("Luis", "Garcia", age=32, throw_hand="R", bat_side="R")) is None
+
+def test_similar_first_name_is_not_a_match():
+    matcher = FuzzyCardMatcher([card("John Smith", age=27, throw_hand="R", bat_hand="L")])
+    assert matcher.match(player("Josh", "Smith", age=27, throw_hand="R", bat_side="L")) is None
+
+def test_nickname_and_suffix_match():
+    cards = [card("Michael Harris II", age=23), card("Vladimir Guerrero", age=25)]
+    matcher = FuzzyCardMatcher(cards)
+    assert matcher.match(player("Mike", "Harris", age=23)) is cards[0]
+    assert matcher.match(player("Vladimir", "Guerrero Jr.", age=25)) is cards[1]
+
+def test_attributes_break_ties():
+    cards = [card("Will Smith", age=29, throw_hand="R"), card("Will Smith", age=34, throw_hand="L")]
+    matcher = FuzzyCardMatcher(cards)
+    assert matcher.match(player("William", "Smith", age=34, throw_hand="L")) is cards[1]
+
+def test_ambiguous_candidates_are_rejected():
+    matcher = FuzzyCardMatcher([card("Will Smith"), card("Will Smith")])
+    assert matcher.match(player("William", "Smith")) is None
+
+def test_used_cards_are_skipped():
+    cards = [card("Michael Harris II")]
+    matcher = FuzzyCardMatcher(cards)
+    assert matcher.match(player("Mike", "Harris"), used={id(cards[0])}) is None
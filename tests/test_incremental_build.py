@@ -0,0 +1,46 @@
+import copy
+import shutil
+from pathlib import Path
+from data_processing.roster_builder import inject_profiles
+
+ROSTER = Path(__file__).parent.parent / "roster.mlb"
+
+def pitcher_card(speed):
+    return {"ovr": 70, "display_position": "SP", "throw_hand": "R", "bat_hand": "R",
+            "pitches": [{"name": "Slider", "speed": speed, "movement": 60, "control": 55}]}
+
+def rosters():
+    players = [{"firstName": f"Player{i}", "lastName": f"Number{i}", "age": 20 + i, "jersey_number": str(i),
+                "mlbCard": pitcher_card(80 + i) if i % 2 else None} for i in range(12)]
+    return {"Team A": players[:6], "Team B": players[6:]}
+
+def build(data, template, output, incremental=False):
+    inject_profiles(copy.deepcopy(data), template_path=str(template), output_path=str(output), incremental=incremental)
+    return output.read_bytes()
+
+def test_incremental_rebuild_matches_a_full_build(tmp_path, capsys):
+    template = tmp_path / "template.mlb"
+    shutil.copyfile(ROSTER, template)
+    incremental_output = tmp_path / "incremental.mlb"
+    data = rosters()
+    build(data, template, incremental_output)
+
+    # An edit, a player gaining pitches (shifting every later pitcher record) and a dropped player
+    data["Team A"][2]["age"] = 40
+    data["Team A"][0]["mlbCard"] = pitcher_card(95)
+    data["Team B"].pop()
+    capsys.readouterr()
+    rebuilt = build(data, template, incremental_output, incremental=True)
+    assert "Re-encoded" in capsys.readouterr().out
+
+    assert rebuilt == build(data, template, tmp_path / "full.mlb")
+
+def test_unchanged_rebuild_touches_no_players(tmp_path, capsys):
+    template = tmp_path / "template.mlb"
+    shutil.copyfile(ROSTER, template)
+    output = tmp_path / "out.mlb"
+    first = build(rosters(), template, output)
+    capsys.readouterr()
+
+    assert build(rosters(), template, output, incremental=True) == first
+    assert "Re-encoded 0 of 12" in capsys.readouterr().out
@@ -0,0 +1,38 @@
+import random
+from util.roster_patch import EOF_OFFSET, IPS_FOOTER, IPS_HEADER, apply_patch, make_patch, read_records
+
+def patched(original, patch, tmp_path):
+    target = tmp_path / "target.mlb"
+    target.write_bytes(original)
+    apply_patch(patch, str(target))
+    return target.read_bytes()
+
+def test_identical_files_give_an_empty_patch():
+    data = bytes(range(256)) * 4
+    assert make_patch(data, data) == IPS_HEADER + IPS_FOOTER
+
+def test_round_trip_with_literals_and_runs(tmp_path):
+    rng = random.Random(0)
+    original = bytes(rng.randrange(256) for _ in range(200_000))
+    modified = bytearray(original)
+    for _ in range(50):
+        start = rng.randrange(len(modified) - 20)
+        length = rng.randrange(1, 20)
+        modified[start:start + length] = bytes(rng.randrange(256) for _ in range(length))
+    modified[1000:1200] = b"\xcd" * 200  # long enough for an RLE record
+    modified = bytes(modified)
+
+    patch = make_patch(original, modified)
+    assert any(len(data) == 200 and set(data) == {0xCD} for _, data in read_records(patch))
+    assert patched(original, patch, tmp_path) == modified
+    assert patched(original, make_patch(original, modified, rle=False), tmp_path) == modified
+
+def test_no_record_starts_at_the_footer_offset(tmp_path):
+    original = bytes(EOF_OFFSET + 64)
+    modified = bytearray(original)
+    modified[EOF_OFFSET:EOF_OFFSET + 32] = b"\x07" * 32
+    modified = bytes(modified)
+
+    patch = make_patch(original, modified)
+    assert EOF_OFFSET not in [offset for offset, _ in read_records(patch)]
+    assert patched(original, patch, tmp_path) == modified
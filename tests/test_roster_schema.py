@@ -0,0 +1,51 @@
+from pathlib import Path
+from data_processing.roster_builder import encode_players
+from util.roster_schema import ATTRIBUTES, PITCHER, PITCH_MAP, PROFILE, SECTIONS, decode_records
+
+ROSTER = Path(__file__).parent.parent / "roster.mlb"
+
+def template():
+    with open(ROSTER, "rb") as f:
+        return bytearray(f.read())
+
+def test_dtype_and_struct_agree():
+    data = template()
+    for section in SECTIONS:
+        view = section.view(data, 3)
+        for record in range(3):
+            values = section.struct.unpack_from(data, section.record_offset(record))
+            for field, value in zip(section.dtype.names, values):
+                field_value = view[field][record]
+                if isinstance(field_value, bytes):
+                    # NumPy drops a string's trailing padding
+                    assert value.rstrip(b"\x00") == field_value, (section.name, field)
+                elif isinstance(value, bytes):
+                    assert value == field_value.tobytes(), (section.name, field)
+                else:
+                    assert value == int(field_value), (section.name, field)
+
+def test_encoded_players_decode_back():
+    card = {"ovr": 88, "contact_left": 120, "display_position": "SP", "throw_hand": "R", "bat_hand": "L",
+            "pitches": [{"name": "Curveball", "speed": 80, "movement": 70, "control": 60}]}
+    players = [
+        {"firstName": "Mike", "lastName": "Trout", "age": 33, "jersey_number": "27", "mlbCard": None},
+        {"firstName": "Gerrit", "lastName": "Cole", "age": 34, "jersey_number": "45", "mlbCard": card},
+    ]
+    data = template()
+    pitcher_count = encode_players(players, data)
+    assert pitcher_count == 1
+
+    profiles = decode_records(PROFILE, data, 2)
+    assert [(p["FirstName"], p["LastName"]) for p in profiles] == [("Mike", "Trout"), ("Gerrit", "Cole")]
+    assert PROFILE.view(data)["AGE"][:2].tolist() == [33, 34]
+    assert PROFILE.view(data)["JERSEY_NUM"][:2].tolist() == [27, 45]
+
+    ratings = decode_records(ATTRIBUTES, data, 2)
+    assert ratings[0]["PLR_ATTRIBUTES"][:2] == [50, 50]
+    # Ratings are clamped to 0-99
+    assert ratings[1]["PLR_ATTRIBUTES"][:2] == [88, 99]
+
+    # The only pitcher takes pitcher record 0, whatever its player record
+    info = PITCHER.view(data)["PITCHER_INFO"][0].tolist()
+    assert info[:4] == [PITCH_MAP["Curveball"], 80, 70, 60]
+    assert info[4] == 0xFF
@@ -0,0 +1,30 @@
+from data_processing.roster_slotting import slot_roster
+
+def player(name, position, ovr, secondary=""):
+    return {"firstName": name, "mlbCard": {"display_position": position, "ovr": ovr,
+                                           "display_secondary_positions": secondary}}
+
+def names(players):
+    return [p["firstName"] for p in players]
+
+def test_primary_positions_fill_first_by_ovr():
+    players = [player("low", "C", 60), player("high", "C", 80), player("first", "1B", 70)]
+    active, aaa = slot_roster(players, [("C", 1), ("1B", 1)])
+    assert names(active) == ["high", "first"]
+    assert names(aaa) == ["low"]
+
+def test_augmenting_path_moves_a_secondary_player_to_fit_another():
+    # Greedily giving "utility" the SS slot would leave "shortstop-only" out;
+    # the matching moves "utility" to 2B instead
+    players = [player("utility", "3B", 90, "SS, 2B"), player("shortstop-only", "1B", 80, "SS"),
+               player("third", "3B", 95)]
+    active, aaa = slot_roster(players, [("3B", 1), ("SS", 1), ("2B", 1)])
+    assert names(active) == ["third", "shortstop-only", "utility"]
+    assert aaa == []
+
+def test_open_slots_and_bench_take_the_best_remaining():
+    players = [player("catcher", "C", 50), player("pitcher", "SP", 85), player("outfielder", "LF", 75),
+               player("spare", "RF", 40)]
+    active, aaa = slot_roster(players, [("C", 1), ("SS", 1), ("BENCH", 1)])
+    assert names(active) == ["catcher", "pitcher", "outfielder"]
+    assert names(aaa) == ["spare"]
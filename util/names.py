@@ -0,0 +1,34 @@
+import unicodedata
+import re
+
+def normalize_name(name):
+    """Convert name to ASCII and remove special characters (only a-z)"""
+    if not name:
+        return ""
+    # Normalize unicode and remove accents
+    normalized = unicodedata.normalize('NFKD', name)
+    ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
+    # Keep only alphabetic characters (remove spaces, punctuation, etc.)
+    return ''.join(c for c in ascii_name if c.isalpha()).lower()
+
+def clean_name(name):
+    """Convert name to ASCII, keep only letters, apostrophes, and periods"""
+    if not name:
+        return ""
+    # Normalize unicode (remove accents/diacritics)
+    normalized = unicodedata.normalize('NFKD', name)
+    ascii_name = normalized.encode('ascii', 'ignore').decode('ascii')
+    # Allow A–Z, a–z, apostrophe, and period
+    cleaned = re.sub(r"[^a-zA-Z'.]", "", ascii_name)
+    return cleaned
+
+def card_name_key(card_name):
+    """Normalized (first, last) of a card name: first word, then everything after it."""
+    parts = (card_name or "").split()
+    first = normalize_name(parts[0]) if parts else ""
+    last = normalize_name(" ".join(parts[1:])) if len(parts) > 1 else ""
+    return first, last
+
+def player_name_key(player):
+    """Normalized (first, last) of a stats API player dict."""
+    return normalize_name(player.get("firstName", "")), normalize_name(player.get("lastName", ""))
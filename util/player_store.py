@@ -0,0 +1,202 @@
+import argparse
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+# Indexed copy of the pipeline's rosters for ad-hoc questions; rewritten after every stage
+DB_PATH = "jsons/players.db"
+
+# A player is identified by their team and slot (their place in the team's list)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    team TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    id INTEGER,
+    first_name TEXT,
+    last_name TEXT,
+    position TEXT,
+    league TEXT,
+    age INTEGER,
+    height TEXT,
+    weight INTEGER,
+    jersey_number TEXT,
+    bat_side TEXT,
+    throw_hand TEXT,
+    ethnicity TEXT,
+    skin_tone INTEGER,
+    PRIMARY KEY (team, slot)
+);
+CREATE INDEX IF NOT EXISTS players_id ON players (id);
+-- NOCASE to match LIKE, so prefix patterns ('text%') can search these instead of scanning
+CREATE INDEX IF NOT EXISTS players_last_name ON players (last_name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS players_first_name ON players (first_name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS cards (
+    team TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    name TEXT,
+    series TEXT,
+    ovr INTEGER,
+    display_position TEXT,
+    secondary_positions TEXT,
+    bat_hand TEXT,
+    throw_hand TEXT,
+    PRIMARY KEY (team, slot)
+);
+CREATE INDEX IF NOT EXISTS cards_ovr ON cards (ovr);
+CREATE INDEX IF NOT EXISTS cards_position ON cards (display_position);
+
+CREATE TABLE IF NOT EXISTS pitches (
+    team TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    pitch_order INTEGER NOT NULL,
+    name TEXT,
+    speed INTEGER,
+    movement INTEGER,
+    control INTEGER,
+    PRIMARY KEY (team, slot, pitch_order)
+);
+CREATE INDEX IF NOT EXISTS pitches_name ON pitches (name);
+
+CREATE TABLE IF NOT EXISTS appearance (
+    team TEXT NOT NULL,
+    slot INTEGER NOT NULL,
+    eye_color TEXT,
+    beard_type TEXT,
+    PRIMARY KEY (team, slot)
+);
+CREATE INDEX IF NOT EXISTS appearance_features ON appearance (beard_type, eye_color);
+"""
+
+TABLES = ["players", "cards", "pitches", "appearance"]
+
+def connect_readonly(path=DB_PATH):
+    """Read-only connection to an existing store; never creates an empty one."""
+    if not os.path.isfile(path):
+        raise FileNotFoundError(
+            f"No player store at {path}; run the pipeline or `python -m util.player_store --load <json>` first")
+    return sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+
+def roster_rows(rosters):
+    """Rows for every table from {team: [player, ...]}."""
+    rows = {table: [] for table in TABLES}
+    for team, players in rosters.items():
+        for slot, player in enumerate(players):
+            rows["players"].append((
+                team, slot, player.get("id"), player.get("firstName"), player.get("lastName"),
+                player.get("position"), player.get("league"), player.get("age"), player.get("height"),
+                player.get("weight"), player.get("jersey_number"), player.get("bat_side"),
+                player.get("throw_hand"), player.get("ethnicity"), player.get("SKIN_TONE"),
+            ))
+
+            card = player.get("mlbCard")
+            if card:
+                rows["cards"].append((
+                    team, slot, card.get("name"), card.get("series"), card.get("ovr"),
+                    card.get("display_position"), card.get("display_secondary_positions"),
+                    card.get("bat_hand"), card.get("throw_hand"),
+                ))
+                for order, pitch in enumerate(card.get("pitches") or []):
+                    rows["pitches"].append((
+                        team, slot, order, pitch.get("name"), pitch.get("speed"),
+                        pitch.get("movement"), pitch.get("control"),
+                    ))
+
+            appearance = player.get("PlayerAppearance")
+            if appearance:
+                rows["appearance"].append((team, slot, appearance.get("EyeColor"), appearance.get("BeardType")))
+    return rows
+
+def save_rosters(rosters, path=DB_PATH):
+    """Recreate the store's tables from rosters in one transaction, so schema changes apply too."""
+    rows = roster_rows(rosters)
+    conn = sqlite3.connect(path)
+    try:
+        conn.execute("BEGIN")
+        for table in TABLES:
+            conn.execute(f"DROP TABLE IF EXISTS {table}")
+        for statement in SCHEMA.split(";"):
+            if statement.strip():
+                conn.execute(statement)
+        for table in TABLES:
+            if rows[table]:
+                placeholders = ", ".join("?" * len(rows[table][0]))
+                conn.executemany(f"INSERT INTO {table} VALUES ({placeholders})", rows[table])
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    print(f"🗄️ Stored {len(rows['players'])} players in {path}")
+
+def query(sql, params=(), path=DB_PATH):
+    conn = connect_readonly(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+def card_counts(path=DB_PATH):
+    """(players with a card, players without one)."""
+    return query("""
+        SELECT COUNT(c.slot), COUNT(*) - COUNT(c.slot)
+        FROM players p LEFT JOIN cards c ON c.team = p.team AND c.slot = p.slot
+    """, path=path)[0]
+
+def team_player_counts(path=DB_PATH):
+    return query("SELECT team, COUNT(*) FROM players GROUP BY team ORDER BY MIN(rowid)", path=path)
+
+def count_pitchers_with_pitches(path=DB_PATH):
+    return query("SELECT COUNT(DISTINCT team || '/' || slot) FROM pitches", path=path)[0][0]
+
+def find_players(text, path=DB_PATH):
+    """(team, slot, first, last) for players whose first or last name starts with text.
+
+    "First Last" matches both parts by prefix. Prefix patterns can use the
+    name indexes; a substring search could not.
+    """
+    def prefix(part):
+        return part.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+    first, _, last = text.strip().partition(" ")
+    join = "AND" if last else "OR"
+    params = (prefix(first), prefix(last.strip() if last else first))
+    return query(f"""
+        SELECT team, slot, first_name, last_name FROM players
+        WHERE first_name LIKE ? ESCAPE '\\' {join} last_name LIKE ? ESCAPE '\\'
+    """, params, path=path)
+
+def eye_color_counts(path=DB_PATH):
+    return dict(query("""
+        SELECT LOWER(eye_color), COUNT(*) FROM appearance
+        WHERE eye_color != '' GROUP BY LOWER(eye_color) ORDER BY COUNT(*) DESC
+    """, path=path))
+
+def beard_type_counts(path=DB_PATH):
+    return dict(query("""
+        SELECT LOWER(beard_type), COUNT(*) FROM appearance
+        WHERE beard_type != '' GROUP BY LOWER(beard_type) ORDER BY COUNT(*) DESC
+    """, path=path))
+
+def skin_tone_counts(path=DB_PATH):
+    """Players per skin tone, labelled SKIN_TONE + 1."""
+    return {str(tone + 1): count for tone, count in query("""
+        SELECT skin_tone, COUNT(*) FROM players
+        WHERE skin_tone IS NOT NULL GROUP BY skin_tone ORDER BY COUNT(*) DESC
+    """, path=path)}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load rosters into the player store or query it.")
+    parser.add_argument("--load", metavar="JSON", help="replace the store with a {team: [player, ...]} file")
+    parser.add_argument("--sql", help="run a query and print the rows")
+    parser.add_argument("--db", default=DB_PATH)
+    args = parser.parse_args()
+
+    if args.load:
+        with open(args.load, "r") as f:
+            save_rosters(json.load(f), args.db)
+    if args.sql:
+        for row in query(args.sql, path=args.db):
+            print(row)
@@ -0,0 +1,78 @@
+import mmap
+from util.roster_schema import SECTIONS, RECORD_COUNT, decode_records
+
+class RosterFile:
+    """A memory-mapped .mlb file with each player section as a structured array view.
+
+    Views are built on first access and share memory with the mapping, so
+    fields are only decoded when read. Open with writable=True to edit the
+    file through the views.
+
+        with RosterFile("roster.mlb") as roster:
+            ages = roster.profile["AGE"]
+    """
+
+    def __init__(self, path, writable=False, count=RECORD_COUNT):
+        self.path = path
+        self.writable = writable
+        self.count = count
+        self._file = open(path, "r+b" if writable else "rb")
+        access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+        self.buffer = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._sections = {section.name: section for section in SECTIONS}
+        self._views = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def section(self, name):
+        """Structured array view over one section ("Profile", "Apparel", "Attributes", "Pitcher")."""
+        if name not in self._views:
+            self._views[name] = self._sections[name].view(self.buffer, self.count)
+        return self._views[name]
+
+    @property
+    def profile(self):
+        return self.section("Profile")
+
+    @property
+    def appearance(self):
+        return self.section("Apparel")
+
+    @property
+    def attributes(self):
+        return self.section("Attributes")
+
+    @property
+    def pitcher(self):
+        return self.section("Pitcher")
+
+    def record(self, index):
+        """One player's sections decoded the same way as the JSON export."""
+        return {name: decode_records(section, self.buffer, 1, index)[0]
+                for name, section in self._sections.items()}
+
+    def records(self, name):
+        """Every record of a section decoded for JSON."""
+        return decode_records(self._sections[name], self.buffer, self.count)
+
+    def flush(self):
+        if self.writable:
+            self.buffer.flush()
+
+    def close(self):
+        self._views.clear()
+        self.flush()
+        try:
+            self.buffer.close()
+        except BufferError:
+            # Arrays taken from the views are still alive; the mapping is
+            # released once they are garbage collected
+            pass
+        self._file.close()
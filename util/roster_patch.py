@@ -0,0 +1,149 @@
+import argparse
+import mmap
+import numpy as np
+
+# IPS patches: "PATCH", then records of (3-byte offset, 2-byte size, data) and "EOF".
+# A record with size 0 is a run: (2-byte length, 1 byte value).
+IPS_HEADER = b"PATCH"
+IPS_FOOTER = b"EOF"
+EOF_OFFSET = 0x454F46  # a record at this offset would read as the footer
+MAX_OFFSET = 0xFFFFFF
+MAX_RECORD = 0xFFFF
+
+# Unchanged bytes shorter than a record header are cheaper to resend than to skip
+MERGE_GAP = 5
+# Runs of one byte at least this long are written as run records
+RLE_MIN_RUN = 9
+
+def changed_ranges(original, modified):
+    """(start, end) byte ranges where modified differs from original, with small gaps merged."""
+    a = np.frombuffer(original, dtype=np.uint8)
+    b = np.frombuffer(modified, dtype=np.uint8)
+    if len(a) != len(b):
+        raise ValueError(f"Roster sizes differ ({len(a)} vs {len(b)} bytes)")
+
+    changed = np.flatnonzero(a != b)
+    if len(changed) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(changed) > MERGE_GAP + 1)
+    starts = np.concatenate(([changed[0]], changed[breaks + 1]))
+    ends = np.concatenate((changed[breaks], [changed[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def byte_runs(chunk):
+    """(start, end, value) runs of identical bytes in chunk."""
+    values = np.frombuffer(chunk, dtype=np.uint8)
+    edges = np.flatnonzero(np.diff(values)) + 1
+    starts = np.concatenate(([0], edges))
+    ends = np.concatenate((edges, [len(values)]))
+    return zip(starts.tolist(), ends.tolist(), values[starts].tolist())
+
+def encode_records(offset, chunk, rle=True):
+    """IPS records for chunk written at offset."""
+    records = []
+    literal_start = 0
+
+    def literal(start, end):
+        for s in range(start, end, MAX_RECORD):
+            data = chunk[s:min(end, s + MAX_RECORD)]
+            records.append((offset + s).to_bytes(3, "big") + len(data).to_bytes(2, "big") + data)
+
+    if rle:
+        for start, end, value in byte_runs(chunk):
+            if end - start < RLE_MIN_RUN:
+                continue
+            literal(literal_start, start)
+            for s in range(start, end, MAX_RECORD):
+                length = min(end, s + MAX_RECORD) - s
+                records.append((offset + s).to_bytes(3, "big") + b"\x00\x00"
+                               + length.to_bytes(2, "big") + bytes([value]))
+            literal_start = end
+    literal(literal_start, len(chunk))
+    return records
+
+def make_patch(original, modified, rle=True):
+    """IPS patch turning original into modified (both bytes-like, same size)."""
+    if len(modified) > MAX_OFFSET:
+        raise ValueError("IPS offsets are limited to 16 MB")
+
+    patch = [IPS_HEADER]
+    for start, end in changed_ranges(original, modified):
+        if start <= EOF_OFFSET < end:
+            # No record may start at EOF_OFFSET (it would read as the footer),
+            # so cover it with a literal record starting one byte earlier
+            pieces = [(start, EOF_OFFSET - 1, rle), (EOF_OFFSET - 1, EOF_OFFSET + 1, False), (EOF_OFFSET + 1, end, rle)]
+        else:
+            pieces = [(start, end, rle)]
+        for piece_start, piece_end, piece_rle in pieces:
+            if piece_end > piece_start:
+                patch += encode_records(piece_start, bytes(modified[piece_start:piece_end]), piece_rle)
+    patch.append(IPS_FOOTER)
+    return b"".join(patch)
+
+def read_records(patch):
+    """Yield (offset, data) for every record in an IPS patch."""
+    if patch[:5] != IPS_HEADER:
+        raise ValueError("Not an IPS patch")
+    i = 5
+    while patch[i:i + 3] != IPS_FOOTER:
+        if i + 5 > len(patch):
+            raise ValueError("Truncated IPS patch")
+        offset = int.from_bytes(patch[i:i + 3], "big")
+        size = int.from_bytes(patch[i + 3:i + 5], "big")
+        i += 5
+        if size:
+            data = patch[i:i + size]
+            i += size
+        else:
+            length = int.from_bytes(patch[i:i + 2], "big")
+            data = patch[i + 2:i + 3] * length
+            i += 3
+        yield offset, data
+
+def apply_patch(patch, target_path):
+    """Patch target_path in place; only the patched pages are touched."""
+    records = list(read_records(patch))
+    with open(target_path, "r+b") as f, mmap.mmap(f.fileno(), 0) as data:
+        for offset, chunk in records:
+            if offset + len(chunk) > len(data):
+                raise ValueError(f"Patch record at {hex(offset)} runs past the end of {target_path}")
+            data[offset:offset + len(chunk)] = chunk
+        data.flush()
+    return len(records)
+
+def create_patch_file(original_path, modified_path, patch_path, rle=True):
+    with open(original_path, "rb") as f:
+        original = f.read()
+    with open(modified_path, "rb") as f:
+        modified = f.read()
+    patch = make_patch(original, modified, rle)
+    with open(patch_path, "wb") as f:
+        f.write(patch)
+    print(f"🩹 Wrote {patch_path} ({len(patch):,} bytes, {len(changed_ranges(original, modified))} changed ranges)")
+    return patch
+
+def apply_patch_file(patch_path, target_path):
+    with open(patch_path, "rb") as f:
+        patch = f.read()
+    count = apply_patch(patch, target_path)
+    print(f"✅ Applied {count} records from {patch_path} to {target_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create or apply IPS patches between roster files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create", help="diff two rosters into a patch")
+    create.add_argument("original")
+    create.add_argument("modified")
+    create.add_argument("patch")
+    create.add_argument("--no-rle", action="store_true", help="write literal records only")
+
+    apply = commands.add_parser("apply", help="patch a roster in place")
+    apply.add_argument("patch")
+    apply.add_argument("target")
+
+    args = parser.parse_args()
+    if args.command == "create":
+        create_patch_file(args.original, args.modified, args.patch, rle=not args.no_rle)
+    else:
+        apply_patch_file(args.patch, args.target)
@@ -0,0 +1,165 @@
+import argparse
+import json
+import os
+import numpy as np
+from util.names import normalize_name
+from util.roster_file import RosterFile
+from util.roster_schema import SECTIONS, STRING_FIELDS
+
+# Players are laid out team by team in blocks of this size (see roster_builder.MAX_PLAYERS)
+TEAM_SIZE = 40
+
+def index_path(mlb_path):
+    return mlb_path + ".index.json"
+
+def name_key(first, last):
+    return f"{normalize_name(first)} {normalize_name(last)}"
+
+def build_index(roster):
+    """{"names": {"first last": [record, ...]}, "player_ids": {id: [record, ...]}, "db_index": {db: record}}"""
+    profile = roster.profile
+    names = {}
+    for record, (first, last) in enumerate(zip(profile["FirstName"].tolist(), profile["LastName"].tolist())):
+        key = name_key(first.decode("ascii", "ignore"), last.decode("ascii", "ignore"))
+        names.setdefault(key, []).append(record)
+
+    player_ids = {}
+    for record, player_id in enumerate(profile["PLAYER_ID"].tolist()):
+        player_ids.setdefault(str(player_id), []).append(record)
+
+    db_index = {str(db): record for record, db in enumerate(profile["DB_INDEX"].tolist())}
+    return {"names": names, "player_ids": player_ids, "db_index": db_index}
+
+class RosterIndex:
+    """Lookups from name, PLAYER_ID, DB_INDEX or team slot to record numbers.
+
+    The index is saved beside the roster as <roster>.index.json and reused
+    while the roster's mtime and size match.
+    """
+
+    def __init__(self, mlb_path):
+        self.path = mlb_path
+        self.index = self.load()
+
+    def load(self):
+        stat = os.stat(self.path)
+        cache = index_path(self.path)
+        if os.path.exists(cache):
+            with open(cache, "r") as f:
+                saved = json.load(f)
+            if saved["source_mtime"] == stat.st_mtime and saved["source_size"] == stat.st_size:
+                return saved["index"]
+
+        with RosterFile(self.path) as roster:
+            index = build_index(roster)
+        with open(cache, "w") as f:
+            json.dump({"source_mtime": stat.st_mtime, "source_size": stat.st_size, "index": index}, f)
+        return index
+
+    def find(self, name=None, player_id=None, db_index=None, team=None, slot=None):
+        """Record numbers matching every given key. slot needs team."""
+        if slot is not None and team is None:
+            raise ValueError("slot is only meaningful with a team")
+        matches = None
+
+        def narrow(records):
+            nonlocal matches
+            records = set(records)
+            matches = records if matches is None else matches & records
+
+        if name is not None:
+            first, _, last = name.strip().partition(" ")
+            narrow(self.index["names"].get(name_key(first, last), []))
+        if player_id is not None:
+            narrow(self.index["player_ids"].get(str(player_id), []))
+        if db_index is not None:
+            record = self.index["db_index"].get(str(db_index))
+            narrow([] if record is None else [record])
+        if team is not None:
+            start = team * TEAM_SIZE
+            narrow([start + slot] if slot is not None else range(start, start + TEAM_SIZE))
+        return sorted(matches or [])
+
+def show_player(mlb_path, record):
+    """Print one player's decoded sections and where each record sits in the file."""
+    with RosterFile(mlb_path) as roster:
+        decoded = roster.record(record)
+    team, slot = divmod(record, TEAM_SIZE)
+    print(f"#{record} (team {team}, slot {slot})")
+    for section in SECTIONS:
+        print(f"  {section.name} @ {hex(section.record_offset(record))}")
+        for field, value in decoded[section.name].items():
+            print(f"    {field}: {value}")
+
+def parse_value(field, value, dtype):
+    """Convert CLI text to what the field's view expects. Raises ValueError if it doesn't fit."""
+    if field in STRING_FIELDS:
+        data = value.encode("ascii", "ignore")
+        if len(data) > dtype.itemsize:
+            raise ValueError(f"{field} holds at most {dtype.itemsize} characters")
+        return data
+    if dtype.shape:
+        try:
+            data = bytes.fromhex(value)
+        except ValueError:
+            raise ValueError(f"{field} takes {dtype.shape[0]} bytes of hex") from None
+        if len(data) != dtype.shape[0]:
+            raise ValueError(f"{field} takes {dtype.shape[0]} bytes of hex")
+        return np.frombuffer(data, dtype=np.uint8)
+    try:
+        number = int(value, 0)
+    except ValueError:
+        raise ValueError(f"{field} takes an integer (decimal or 0x hex)") from None
+    if not 0 <= number <= np.iinfo(dtype).max:
+        raise ValueError(f"{field} must be between 0 and {np.iinfo(dtype).max}")
+    return number
+
+def parse_edit(target, value):
+    """(section name, field, value) for a "SECTION.FIELD" edit, checked against the section layouts."""
+    sections = {section.name: section for section in SECTIONS}
+    section_name, dot, field = target.partition(".")
+    if not dot:
+        raise ValueError(f"expected SECTION.FIELD, got {target!r}")
+    if section_name not in sections:
+        raise ValueError(f"unknown section {section_name!r} (expected one of {', '.join(sections)})")
+    dtype = sections[section_name].dtype
+    if field not in dtype.names:
+        raise ValueError(f"{section_name} has no field {field!r}")
+    return section_name, field, parse_value(field, value, dtype.fields[field][0])
+
+def edit_player(mlb_path, record, target, value):
+    """Write one "SECTION.FIELD" of one record in place. The value is validated before the file is opened."""
+    section_name, field, parsed = parse_edit(target, value)
+    with RosterFile(mlb_path, writable=True) as roster:
+        roster.section(section_name)[field][record] = parsed
+    # Writes through a mapping don't always bump the mtime, and the cached index keys on it
+    os.utime(mlb_path)
+    print(f"✏️ #{record} {section_name}.{field} = {value}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Look up or edit players in a .mlb roster.")
+    parser.add_argument("roster")
+    parser.add_argument("name", nargs="?", help='"First Last"')
+    parser.add_argument("--id", type=lambda v: int(v, 0), help="PLAYER_ID")
+    parser.add_argument("--db", type=int, help="DB_INDEX")
+    parser.add_argument("--team", type=int)
+    parser.add_argument("--slot", type=int, help="slot within --team")
+    parser.add_argument("--set", nargs=2, metavar=("SECTION.FIELD", "VALUE"),
+                        help="edit the matching player, e.g. --set Profile.AGE 31")
+    args = parser.parse_args()
+    if args.slot is not None and args.team is None:
+        parser.error("--slot needs --team")
+
+    records = RosterIndex(args.roster).find(args.name, args.id, args.db, args.team, args.slot)
+    if not records:
+        print("No matching players")
+    elif args.set:
+        if len(records) > 1:
+            parser.error(f"{len(records)} players match; narrow the search to edit")
+        try:
+            edit_player(args.roster, records[0], *args.set)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        for record in records:
+            show_player(args.roster, record)
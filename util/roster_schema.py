@@ -0,0 +1,241 @@
+import struct
+import numpy as np
+
+# Shared record layouts for .mlb roster files, used by both the builder
+# (data_processing/roster_builder.py) and the readers in util/.
+# Each layout is a list of (field, size in bytes); it is compiled once into
+# a NumPy structured dtype (whole-section views) and a struct.Struct (one record).
+
+RECORD_COUNT = 1365
+
+# == Roster File ==
+PROFILE_OFFSET = 0x0001CA90
+APPEARANCE_OFFSET = 0x0003AFDB
+ATTRIBUTES_OFFSET = 0x0004153E
+PITCHER_OFFSET = 0x0004DFF0
+TEAM_LINEUP_OFFSET = 0x00011A91
+TEAM_LINEUP_SIZE = 423
+TEAM_LINEUP_COUNT = 103
+
+# Inside each TEAM_LINEUP block: five lineups of nine batters, nine position codes
+# and a flag byte, then 4-byte player list entries from TEAM_PLAYER_LIST_OFFSET
+LINEUP_COUNT = 5
+LINEUP_SIZE = 19
+LINEUP_BATTERS = 9
+TEAM_PLAYER_LIST_OFFSET = 98
+TEAM_PLAYER_LIST_ENTRY = 4
+TEAM_PLAYER_LIST_LENGTH = 76
+
+# == RTTS File ==
+# PROFILE_OFFSET = 0x00026914
+# ATTRIBUTES_OFFSET = 0x0004B3C2
+# APPEARANCE_OFFSET = 0x00044E5F
+# PITCHER_OFFSET = 0x00057E74
+
+PLAYER_LAYOUT = [
+    ("PLAYER_ID", 2), ("PLAYER_FLAGS", 2), ("FirstName", 16), ("LastName", 16),
+    ("Weight", 2), ("Height", 1), ("JERSEY_NUM", 1), ("ORIG_JERSEY_NUM", 1),
+    ("POSITION", 1), ("PITCHER_ROLE", 1), ("SKIN_TONE", 1), ("AGE", 1),
+    ("HANDEDNESS", 1), ("ENERGY", 1), ("CONFIDENCE", 1), ("DL_TIME", 1),
+    ("INJURY_TYPE", 1), ("INJURY_DATE", 1), ("INJURY_DUR", 1), ("ML_OPTIONS", 1),
+    ("DB_INDEX", 2), ("MUG_INDEX", 2), ("DATA_BLOCK", 1), ("DATA_BLOCK2", 4),
+    ("DATA_BLOCK3", 4), ("SECONDARY_POS", 1), ("SERIES_PERF", 1),
+    ("BAT_WALK_MUS_HND", 1), ("HR_CELEB_MUS_HND", 1), ("RELIEVER_MUS_HND", 1),
+    ("MUSIC_START_DATA", 1), ("CONTRACT", 12), ("MORALE", 7)
+]
+
+PLAYER_ATTS_LAYOUT = [
+    ("BAT_PRC_FLY_GB", 1), ("BAT_PRC_L_FIELD", 1), ("BAT_PRC_R_FIELD", 1),
+    ("PLR_ATTRIBUTES", 20), ("PERF_VAL", 1), ("LAST_PERF_VAL", 1),
+    ("PREV_PERF_VAL", 1), ("HIT_ZONES", 12),
+]
+
+PLAYER_PITCHER_LAYOUT = [
+    ("PITCHER_INFO", 24), ("PITCHER_ATTS", 6), ("DATA", 1), ("GOTO_PITCH", 1),
+]
+
+PLAYER_APP_LAYOUT = [
+    ("FACETYPE", 1), ("SOCKTYPE", 1), ("BODYTYPE", 1), ("GC_BC_8.SG_EP_ET", 1),
+    ("SG_EP_ETH_ETP_8", 1), ("CATCHERMASK", 1), ("KNEESAVERS", 1),
+    ("BATTINGGLOVE", 1), ("STRIDE", 1), ("BATSTANCE", 1), ("BATFOLLOWTHRU", 1),
+    ("PITCHDELIVERY", 2), ("BATSTYLE", 2), ("FEATURE_DATA", 4),
+]
+
+# Null-padded ASCII fields
+STRING_FIELDS = {"FirstName", "LastName", "ABBREV_N"}
+
+# Two-byte fields that hold a single little-endian number
+WORD_FIELDS = {"PLAYER_ID", "PLAYER_FLAGS", "Weight", "DB_INDEX", "MUG_INDEX"}
+
+def field_format(field, size):
+    """(NumPy dtype, struct format) for one layout field."""
+    if field in STRING_FIELDS:
+        return f"S{size}", f"{size}s"
+    if field in WORD_FIELDS and size == 2:
+        return "<u2", "H"
+    if size == 1:
+        return "u1", "B"
+    return ("u1", (size,)), f"{size}s"
+
+class Section:
+    """One fixed-size record table in a .mlb file."""
+
+    def __init__(self, name, offset, layout, count=RECORD_COUNT):
+        self.name = name
+        self.offset = offset
+        self.layout = layout
+        self.count = count
+        formats = [field_format(field, size) for field, size in layout]
+        self.dtype = np.dtype([(field, fmt[0]) for (field, _), fmt in zip(layout, formats)])
+        self.struct = struct.Struct("<" + "".join(fmt[1] for fmt in formats))
+        self.size = self.dtype.itemsize
+        assert self.size == self.struct.size == sum(size for _, size in layout)
+
+        self.field_offsets = {}
+        position = 0
+        for field, size in layout:
+            self.field_offsets[field] = (position, size)
+            position += size
+
+    @property
+    def end(self):
+        return self.offset + self.count * self.size
+
+    def record_offset(self, index):
+        return self.offset + index * self.size
+
+    def view(self, buffer, count=None, start=0):
+        """Structured array over the section; zero-copy, and writable when the buffer is."""
+        count = self.count - start if count is None else count
+        return np.frombuffer(buffer, dtype=self.dtype, count=count, offset=self.record_offset(start))
+
+    def raw(self, buffer, count=None, start=0):
+        """The same records as a (count, size) uint8 array."""
+        count = self.count - start if count is None else count
+        return np.frombuffer(buffer, dtype=np.uint8, count=count * self.size,
+                             offset=self.record_offset(start)).reshape(count, self.size)
+
+PROFILE = Section("Profile", PROFILE_OFFSET, PLAYER_LAYOUT)
+APPEARANCE = Section("Apparel", APPEARANCE_OFFSET, PLAYER_APP_LAYOUT)
+ATTRIBUTES = Section("Attributes", ATTRIBUTES_OFFSET, PLAYER_ATTS_LAYOUT)
+PITCHER = Section("Pitcher", PITCHER_OFFSET, PLAYER_PITCHER_LAYOUT)
+SECTIONS = [PROFILE, APPEARANCE, ATTRIBUTES, PITCHER]
+
+def lineup_field(position):
+    """Label for a byte offset within a TEAM_LINEUP block, e.g. "lineup 2 batter[4]" or "player_list[31]"."""
+    if position < LINEUP_COUNT * LINEUP_SIZE:
+        lineup, byte = divmod(position, LINEUP_SIZE)
+        if byte < LINEUP_BATTERS:
+            return f"lineup {lineup} batter[{byte}]"
+        if byte < 2 * LINEUP_BATTERS:
+            return f"lineup {lineup} position[{byte - LINEUP_BATTERS}]"
+        return f"lineup {lineup} flag"
+    entry = (position - TEAM_PLAYER_LIST_OFFSET) // TEAM_PLAYER_LIST_ENTRY
+    if position >= TEAM_PLAYER_LIST_OFFSET and entry < TEAM_PLAYER_LIST_LENGTH:
+        return f"player_list[{entry}]"
+    return f"byte 0x{position:X}"
+
+def read_sections(buffer, count=RECORD_COUNT):
+    """{section name: structured array view} for every player section."""
+    return {section.name: section.view(buffer, count) for section in SECTIONS}
+
+# === Value tables used by the encoder ===
+
+POSITION_MAP = {
+    "P": 0, "C": 1, "1B": 2, "2B": 3, "3B": 4, "SS": 5,
+    "LF": 6, "CF": 7, "RF": 8
+}
+
+PITCH_MAP = {
+    "4-Seam Fastball": 0x00,
+    "Sinker": 0x01,
+    "Curveball": 0x02,
+    "Slider": 0x03,
+    "Slurve": 0x04,
+    "Splitter": 0x05,
+    "Changeup": 0x06,
+    "Knuckleball": 0x07,
+    "2-Seam Fastball": 0x08,
+    "Cutter": 0x09,
+    # "Circle-Change": 0x0A,
+    # "Palmball": 0x0B,
+    # "Forkball": 0x0C,
+    # "Knuckle-Curve": 0x0D,
+    # "Screwball": 0x0E,
+    # "12-6 Curve": 0x0F,
+    # "Sweeping Curve": 0x10,
+    # "Running Fastball": 0x11,
+    "NONE": 0xFF,
+}
+PITCH_NAMES = {code: name for name, code in PITCH_MAP.items()}
+
+PITCHER_ROLE_MAP = {
+    "SP": 0, "RP": 1, "CP": 2
+}
+
+def get_handedness(throw, bat):
+    """HANDEDNESS byte for a throw / bat hand pair.
+
+    - 00 = Right, Right
+    - 01 = Left, Right
+    - 10 = Right, Left
+    - 11 = Left, Left
+    """
+    if throw == "L":
+        if bat == "L":
+            return 0x11
+        else:
+            return 0x01
+    else:
+        if bat == "R":
+            return 0x00
+        else:
+            return 0x10
+
+# (eye color, beard type) -> FEATURE_DATA; anything else is clean shaven, brown eyes
+FEATURE_BYTES = {
+    ("brown", "full"): bytes([0x11, 0x00, 0x00, 0x00]),
+    ("blue", "full"): bytes([0x10, 0x10, 0x00, 0x00]),
+    ("brown", "goatee"): bytes([0x00, 0x00, 0x08, 0x00]),
+    ("blue", "goatee"): bytes([0x00, 0x10, 0x08, 0x00]),
+    ("brown", "stubble"): bytes([0x08, 0x00, 0x00, 0x00]),
+    ("blue", "stubble"): bytes([0x08, 0x10, 0x00, 0x00]),
+    ("brown", "mustache"): bytes([0x00, 0x00, 0x01, 0x00]),
+    ("blue", "mustache"): bytes([0x01, 0x10, 0x01, 0x00]),
+    ("brown", "none"): bytes([0x01, 0x00, 0x00, 0x00]),
+    ("blue", "none"): bytes([0x01, 0x10, 0x00, 0x00]),
+}
+DEFAULT_FEATURE_BYTES = bytes([0x00, 0x00, 0x00, 0x00])
+
+# Card fields written to PLR_ATTRIBUTES, in byte order (ovr doubles as potential)
+RATING_FIELDS = [
+    "ovr", "contact_left", "contact_right", "power_left", "power_right",
+    "batting_clutch", "bunting_ability", "drag_bunting_ability", "plate_vision",
+    "plate_discipline", "ovr", "hitting_durability", "speed", "baserunning_ability",
+    "baserunning_aggression", "arm_strength", "arm_accuracy", "fielding_ability",
+    "reaction_time", "blocking",
+]
+
+# Card fields written to PITCHER_ATTS, in byte order
+PITCHER_ATT_FIELDS = ["stamina", "pitching_clutch", "hits_per_bf", "hr_per_bf", "k_per_bf", "bb_per_bf"]
+MAX_PITCHES = 6
+
+def decode_records(section, buffer, count=None, start=0):
+    """JSON-ready dicts for a run of records: names as text, PLR_ATTRIBUTES as
+    a list of ints, every other field as the hex of its raw bytes."""
+    view = section.view(buffer, count, start)
+    raw_hex = section.raw(buffer, count, start).tobytes().hex()
+    width = section.size * 2
+
+    columns = {}
+    for field, (position, size) in section.field_offsets.items():
+        if field in STRING_FIELDS:
+            columns[field] = [value.split(b'\x00')[0].decode('ascii', errors='ignore') for value in view[field]]
+        elif field == "PLR_ATTRIBUTES":
+            columns[field] = view[field].tolist()
+        else:
+            columns[field] = [raw_hex[i + position * 2:i + (position + size) * 2]
+                              for i in range(0, len(raw_hex), width)]
+
+    fields = list(columns)
+    return [dict(zip(fields, values)) for values in zip(*columns.values())]
@@ -1,4 +1,10 @@
 import json
+import os
+import numpy as np
+from util import player_store
+from util.roster_schema import (
+    SECTIONS, STRING_FIELDS, WORD_FIELDS, TEAM_LINEUP_OFFSET, TEAM_LINEUP_SIZE, TEAM_LINEUP_COUNT, lineup_field,
+)
 
 # Count players within rnage
 def count_players_in_range(file_path, start, end, size):
@@ -15,6 +21,88 @@ def count_players_in_range(file_path, start, end, size):
             offset = start + (i * size)
             print(f"  Player {i + 1}: Offset 0x{offset:X}")
 
+def field_label(field, size, position):
+    """Field name, with the byte index for multi-byte fields that aren't one value (e.g. PLR_ATTRIBUTES[3])."""
+    if size == 1 or field in STRING_FIELDS or field in WORD_FIELDS:
+        return field
+    return f"{field}[{position}]"
+
+def byte_runs(offsets):
+    """Collapse sorted byte offsets into (start, end) runs."""
+    if len(offsets) == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(offsets) > 1)
+    starts = np.concatenate(([offsets[0]], offsets[breaks + 1]))
+    ends = np.concatenate((offsets[breaks], [offsets[-1]])) + 1
+    return list(zip(starts.tolist(), ends.tolist()))
+
+def diff_mlb(data1, data2):
+    """Map every differing byte to a record and field.
+
+    Returns ({player: [(section, label), ...]}, {pitcher record: [label, ...]},
+    {team: [lineup label, ...]}, [(start, end) runs outside those sections],
+    (len1, len2)). Pitcher records are packed in roster order, so their index
+    is not a player index.
+    Only the bytes that differ are visited in Python; finding them and placing
+    them in records is done in NumPy.
+    """
+    a = np.frombuffer(data1, dtype=np.uint8)
+    b = np.frombuffer(data2, dtype=np.uint8)
+    common = min(len(a), len(b))
+    changed = np.flatnonzero(a[:common] != b[:common])
+
+    players, pitchers = {}, {}
+    covered = np.zeros(len(changed), dtype=bool)
+    for section in SECTIONS:
+        inside = (changed >= section.offset) & (changed < section.end)
+        covered |= inside
+        record, within = np.divmod(changed[inside] - section.offset, section.size)
+
+        fields = list(section.field_offsets.items())
+        starts = np.array([start for _, (start, _) in fields])
+        collapsed = np.array([field_label(field, size, 0) == field for field, (_, size) in fields])
+        field_index = np.searchsorted(starts, within, side="right") - 1
+
+        # Bytes of a name or a 2-byte number count once; other fields keep their byte index
+        position = np.where(collapsed[field_index], 0, within - starts[field_index])
+        keys = np.unique(record * section.size + starts[field_index] + position)
+        record, within = np.divmod(keys, section.size)
+        field_index = np.searchsorted(starts, within, side="right") - 1
+
+        for index, k, offset in zip(record.tolist(), field_index.tolist(), (within - starts[field_index]).tolist()):
+            field, (_, size) = fields[k]
+            label = field_label(field, size, offset)
+            if section.name == "Pitcher":
+                pitchers.setdefault(index, []).append(label)
+            else:
+                players.setdefault(index, []).append((section.name, label))
+
+    lineups = {}
+    lineup_end = TEAM_LINEUP_OFFSET + TEAM_LINEUP_COUNT * TEAM_LINEUP_SIZE
+    inside = (changed >= TEAM_LINEUP_OFFSET) & (changed < lineup_end)
+    covered |= inside
+    team, within = np.divmod(changed[inside] - TEAM_LINEUP_OFFSET, TEAM_LINEUP_SIZE)
+    for t, position in zip(team.tolist(), within.tolist()):
+        label = lineup_field(position)
+        # A multi-byte player list entry counts once
+        if not lineups.get(t) or lineups[t][-1] != label:
+            lineups.setdefault(t, []).append(label)
+
+    other = byte_runs(changed[~covered])
+    return players, pitchers, lineups, other, (len(a), len(b))
+
+def pitcher_owners(mlb_path):
+    """{pitcher record: player} from the build manifest beside mlb_path, or {} if there is no current one."""
+    path = mlb_path + ".manifest.json"
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    stat = os.stat(mlb_path)
+    if manifest.get("output_mtime") != stat.st_mtime or manifest.get("output_size") != stat.st_size:
+        return {}
+    return {k: player for player, k in enumerate(manifest.get("pitcher_slots", [])) if k >= 0}
+
 # Find differences betweeen two .mlb files
 def compare_mlb_files(file1_path, file2_path):
     try:
@@ -25,95 +113,82 @@ def compare_mlb_files(file1_path, file2_path):
         print(f"❌ File not found: {e.filename}")
         return
 
-    len1, len2 = len(data1), len(data2)
-    max_len = max(len1, len2)
-
+    players, pitchers, lineups, other, (len1, len2) = diff_mlb(data1, data2)
     print(f"Comparing:\n  {file1_path} ({len1} bytes)\n  {file2_path} ({len2} bytes)\n")
 
-    differences_found = False
-
-    for i in range(max_len):
-        byte1 = data1[i] if i < len1 else None
-        byte2 = data2[i] if i < len2 else None
-
-        if byte1 != byte2:
-            differences_found = True
-            b1 = f"{byte1:02X}" if byte1 is not None else "EOF"
-            b2 = f"{byte2:02X}" if byte2 is not None else "EOF"
-            print(f"Offset 0x{i:04X}: File1 = {b1} | File2 = {b2}")
-
-    if not differences_found:
+    if not players and not pitchers and not lineups and not other and len1 == len2:
         print("✅ Files are identical.")
+        return
 
-# Find location of string within json
-def find_string_in_json(file_path, search_string):
-    found_lines = []
-
-    with open(file_path, 'r', encoding='utf-8') as f:
-        for i, line in enumerate(f, start=1):
-            if search_string in line:
-                found_lines.append(i)
-
-    if found_lines:
-        print(f"Found '{search_string}' on line(s): {found_lines}")
-    else:
-        print(f"'{search_string}' not found in {file_path}.")
+    # Pitcher record k belongs to whichever player the second file's build put there
+    owners = pitcher_owners(file2_path)
+    unowned = {}
+    for k, labels in pitchers.items():
+        if k in owners:
+            players.setdefault(owners[k], []).extend(("Pitcher", label) for label in labels)
+        else:
+            unowned[k] = labels
+
+    profiles = SECTIONS[0].view(data2) if len(data2) >= SECTIONS[0].end else None
+    for player in sorted(players):
+        name = ""
+        if profiles is not None:
+            first, last = profiles["FirstName"][player], profiles["LastName"][player]
+            name = f" ({first.decode('ascii', 'ignore')} {last.decode('ascii', 'ignore')})"
+        by_section = {}
+        for section, label in players[player]:
+            by_section.setdefault(section, []).append(label)
+        changes = "; ".join(f"{section}: {', '.join(labels)}" for section, labels in by_section.items())
+        print(f"player {player}{name} {changes}")
+
+    for k in sorted(unowned):
+        print(f"pitcher record {k} Pitcher: {', '.join(unowned[k])}")
+
+    for team in sorted(lineups):
+        print(f"team {team} Lineups: {', '.join(lineups[team])}")
+
+    for start, end in other:
+        print(f"Offset 0x{start:04X}-0x{end - 1:04X}: {end - start} byte(s) outside player records")
+    if len1 != len2:
+        print(f"Sizes differ: File1 = {len1} bytes | File2 = {len2} bytes")
+
+    print(f"\n{len(players)} player(s), {len(unowned)} unmapped pitcher record(s), {len(lineups)} team lineup block(s) "
+          f"and {len(other)} other range(s) differ")
 
 # Function to find count of players who have a non null mlb_card attribute
-def playersWithValidCards(file_name):
-    with open(file_name, 'r') as f:
-        data = json.load(f)
-
-    has_card = 0
-    no_card = 0
-
-    for team, players in data.items():
-        for player in players:
-            if player.get("mlbCard"):
-                has_card += 1
-            else:
-                no_card += 1
+def playersWithValidCards(db_path=player_store.DB_PATH):
+    has_card, no_card = player_store.card_counts(db_path)
 
     print(f"Players with MLB card: {has_card}")
     print(f"Players without MLB card: {no_card}")
 
-def display_team_player_counts(filepath):
-    """Print the count of players for each team in the given JSON file."""
-    with open(filepath, "r") as f:
-        data = json.load(f)
+def display_team_player_counts(db_path=player_store.DB_PATH):
+    """Print the count of players for each team in the player store."""
+    counts = player_store.team_player_counts(db_path)
 
     print("\n--- Player Counts by Team ---\n")
-    for team, players in data.items():
-        print(f"{team}: {len(players)} players")
+    for team, count in counts:
+        print(f"{team}: {count} players")
 
-    print("\nTotal players across all teams:", sum(len(players) for players in data.values()))
+    print("\nTotal players across all teams:", sum(count for _, count in counts))
 
-def count_pitchers_with_pitches(filepath) -> int:
-    """
-    Reads a JSON roster file and counts how many players
-    have a 'pitches' array with length > 0 inside 'mlbCard'.
-    """
-    with open(filepath, "r") as f:
-        data = json.load(f)
-
-    count = 0
+def count_pitchers_with_pitches(db_path=player_store.DB_PATH) -> int:
+    """Count players whose card lists at least one pitch."""
+    return player_store.count_pitchers_with_pitches(db_path)
 
-    # Iterate through each team
-    for team, players in data.items():
-        for player in players:
-            if "mlbCard" in player:
-                mlb_card = player.get("mlbCard")
-                if mlb_card is not None:
-                    pitches = mlb_card.get("pitches", [])
-                    if len(pitches) > 0:
-                        count += 1
-
-    return count
+# Find players whose first or last name starts with the search string
+def find_player(search_string, db_path=player_store.DB_PATH):
+    matches = player_store.find_players(search_string, db_path)
+    if matches:
+        for team, slot, first, last in matches:
+            print(f"{first} {last} | Team: {team} | Slot: {slot}")
+    else:
+        print(f"'{search_string}' not found in {db_path}.")
 
 # Example usage:
 # compare_mlb_files('lineup1.mlb', 'lineup2.mlb')
-# playersWithValidCards('jsons/combined_players.json');
-# find_string_in_json("player_data.json", "Kittredge")
+# playersWithValidCards()
+# find_player("Kittredge")
 # count_players_in_range('rosters/roster.mlb', 0x00026914, 0x00044E4A, 91)
-# display_team_player_counts("jsons/combined_players.json")
-print(count_pitchers_with_pitches("jsons/combined_players.json"))
\ No newline at end of file
+# display_team_player_counts()
+# print(count_pitchers_with_pitches())
\ No newline at end of file
@@ -2,27 +2,54 @@ import os
 import cv2
 import json
 import pickle
-from glob import glob
+import hashlib
+import numpy as np
 from insightface.app import FaceAnalysis
+from data_collection.headshots import find_headshot
 
 JSON_PATH = "jsons/combined_players.json"
 IMAGE_DIR = "mlb_headshots/"
 OUTPUT_JSON = "jsons/mlb_players_with_appearance.json"
+CLASSIFIER_DIR = "visual_analysis/classifiers"
 
-# Load face model
-app = FaceAnalysis(name="buffalo_l", providers=["CPUExecutionProvider"])
-app.prepare(ctx_id=0, det_size=(640, 640))
+# Headshot embeddings cache: one float32 row per face in embeddings-<content hash>.npy (memory-mapped
+# on load), and that file name, its row count and {player_id: {"sha256": image hash, "row": row or
+# null if no face}} in EMBEDDING_INDEX_PATH. Each save writes a new matrix file before swapping the
+# index, so the index always names a matrix it was written for.
+FACE_MODEL = "buffalo_l"
+EMBEDDING_DIR = "visual_analysis/embeddings/headshots"
+EMBEDDING_INDEX_PATH = os.path.join(EMBEDDING_DIR, "index.json")
 
-# Load classifiers
-clf_eye = pickle.load(open("eye_color.pkl", "rb"))
-enc_eye = pickle.load(open("eye_color_labels.pkl", "rb"))
+# Face model and classifiers, loaded on first use
+app = None
+clf_eye = enc_eye = clf_beard = enc_beard = None
 
-clf_beard = pickle.load(open("beard.pkl", "rb"))
-enc_beard = pickle.load(open("beard_labels.pkl", "rb"))
 
+def load_face_model():
+    global app
+    if app is not None:
+        return
 
-def classify_image(image_path):
-    """Classify single image"""
+    app = FaceAnalysis(name=FACE_MODEL, providers=["CPUExecutionProvider"])
+    app.prepare(ctx_id=0, det_size=(640, 640))
+
+
+def load_models():
+    global clf_eye, enc_eye, clf_beard, enc_beard
+    if clf_eye is not None:
+        return
+
+    # Load classifiers
+    clf_eye = pickle.load(open(os.path.join(CLASSIFIER_DIR, "eye_color.pkl"), "rb"))
+    enc_eye = pickle.load(open(os.path.join(CLASSIFIER_DIR, "eye_color_labels.pkl"), "rb"))
+
+    clf_beard = pickle.load(open(os.path.join(CLASSIFIER_DIR, "beard.pkl"), "rb"))
+    enc_beard = pickle.load(open(os.path.join(CLASSIFIER_DIR, "beard_labels.pkl"), "rb"))
+
+
+def embed_image(image_path):
+    """InsightFace embedding of the first face in an image, or None."""
+    load_face_model()
     img = cv2.imread(image_path)
 
     if img is None:
@@ -33,56 +60,177 @@ def classify_image(image_path):
     if len(faces) == 0:
         return None
 
-    emb = faces[0].embedding
+    return faces[0].embedding
 
-    eye = enc_eye.inverse_transform([clf_eye.predict([emb])[0]])[0]
-    beard = enc_beard.inverse_transform([clf_beard.predict([emb])[0]])[0]
 
-    return {
-        "EyeColor": eye,
-        "BeardType": beard
-    }
+def predict_appearance(embeddings):
+    """[{"EyeColor", "BeardType"}] for a (n, dim) embedding matrix, one predict call per classifier."""
+    load_models()
+    if len(embeddings) == 0:
+        return []
 
+    eyes = enc_eye.inverse_transform(clf_eye.predict(embeddings))
+    beards = enc_beard.inverse_transform(clf_beard.predict(embeddings))
 
-def update_json():
-    with open(JSON_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    return [{"EyeColor": str(eye), "BeardType": str(beard)} for eye, beard in zip(eyes, beards)]
 
-    total = 0
-    updated = 0
-    missing_images = 0
-    no_face = 0
 
-    for team, players in data.items():
-        for player in players:
-            total += 1
-            player_id = str(player.get("id"))
+def classify_image(image_path):
+    """Classify single image"""
+    emb = embed_image(image_path)
 
-            image_path = os.path.join(IMAGE_DIR, f"{player_id}.jpg")
+    if emb is None:
+        return None
 
-            if not os.path.exists(image_path):
-                print(f"[MISSING IMAGE] {player_id}.jpg")
-                missing_images += 1
-                continue
+    return predict_appearance(np.array([emb]))[0]
+
+
+def image_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_embedding_cache():
+    """(index, embeddings) from disk; embeddings is memory-mapped. Empty if the cache is unusable."""
+    if not os.path.exists(EMBEDDING_INDEX_PATH):
+        return {}, None
+
+    try:
+        with open(EMBEDDING_INDEX_PATH, "r", encoding="utf-8") as f:
+            saved = json.load(f)
+    except json.JSONDecodeError:
+        print("⚠️ Embedding index is unreadable; recomputing embeddings")
+        return {}, None
+
+    embeddings_path = os.path.join(EMBEDDING_DIR, saved.get("embeddings", ""))
+    if saved.get("model") != FACE_MODEL or not os.path.isfile(embeddings_path):
+        return {}, None
+
+    embeddings = np.load(embeddings_path, mmap_mode="r")
+    if embeddings.shape[0] != saved.get("rows"):
+        print("⚠️ Embedding index doesn't match its matrix; recomputing embeddings")
+        return {}, None
+
+    return saved["players"], embeddings
+
+
+def save_embedding_cache(index, embeddings):
+    """Write the matrix under a new name, then atomically swap in an index that points at it."""
+    os.makedirs(EMBEDDING_DIR, exist_ok=True)
+    name = f"embeddings-{hashlib.sha256(embeddings.tobytes()).hexdigest()[:16]}.npy"
+    np.save(os.path.join(EMBEDDING_DIR, name + ".tmp.npy"), embeddings)
+    os.replace(os.path.join(EMBEDDING_DIR, name + ".tmp.npy"), os.path.join(EMBEDDING_DIR, name))
+
+    with open(EMBEDDING_INDEX_PATH + ".tmp", "w", encoding="utf-8") as f:
+        json.dump({"model": FACE_MODEL, "embeddings": name, "rows": len(embeddings), "players": index}, f)
+    os.replace(EMBEDDING_INDEX_PATH + ".tmp", EMBEDDING_INDEX_PATH)
+
+    # Matrices from earlier saves are no longer referenced
+    for old in os.listdir(EMBEDDING_DIR):
+        if old.startswith("embeddings") and old.endswith(".npy") and old != name:
+            try:
+                os.remove(os.path.join(EMBEDDING_DIR, old))
+            except OSError:
+                pass
+
+
+def headshot_embeddings(player_ids):
+    """{player_id: embedding or None (no face)} for every id with a headshot.
+
+    Embeddings are cached by player ID and image hash, so face analysis only
+    runs for new or changed headshots. Players without an image are left out.
+    """
+    index, cached = load_embedding_cache()
+    result = {}
+    computed = {}
+
+    for player_id in player_ids:
+        if player_id in result:
+            continue
+        image_path = find_headshot(player_id, IMAGE_DIR)
+        if image_path is None:
+            continue
+
+        digest = image_hash(image_path)
+        entry = index.get(player_id)
+        if entry is not None and entry["sha256"] == digest and cached is not None:
+            result[player_id] = None if entry["row"] is None else cached[entry["row"]]
+            continue
+
+        print(f"[EMBED] {os.path.basename(image_path)}")
+        computed[player_id] = (digest, embed_image(image_path))
+        result[player_id] = computed[player_id][1]
+
+    if computed:
+        # Rewrite the cache with the embeddings still in use plus the new ones
+        new_index = {}
+        rows = []
+        for player_id, embedding in result.items():
+            digest = computed[player_id][0] if player_id in computed else index[player_id]["sha256"]
+            new_index[player_id] = {"sha256": digest, "row": None if embedding is None else len(rows)}
+            if embedding is not None:
+                rows.append(np.asarray(embedding, dtype=np.float32))
+
+        # Keep cached players that weren't asked about this time
+        for player_id, entry in index.items():
+            if player_id not in new_index and entry["row"] is not None and cached is not None:
+                new_index[player_id] = {"sha256": entry["sha256"], "row": len(rows)}
+                rows.append(np.asarray(cached[entry["row"]], dtype=np.float32))
+            elif player_id not in new_index:
+                new_index[player_id] = entry
+
+        dim = rows[0].shape[0] if rows else 512
+        save_embedding_cache(new_index, np.array(rows, dtype=np.float32).reshape(len(rows), dim))
+
+    return result
+
+
+def classify_players(data):
+    """Add "PlayerAppearance" to every player with a usable headshot. Updates and returns data."""
+    players = [player for team_players in data.values() for player in team_players]
+    embeddings = headshot_embeddings([str(player.get("id")) for player in players])
+
+    total = len(players)
+    missing_images = 0
+    no_face = 0
+    faces = []
+
+    for player in players:
+        player_id = str(player.get("id"))
 
-            appearance = classify_image(image_path)
+        if player_id not in embeddings:
+            print(f"[MISSING IMAGE] {player_id}")
+            missing_images += 1
+            continue
 
-            if appearance is None:
-                print(f"[NO FACE] {player_id}.jpg")
-                no_face += 1
-                continue
+        if embeddings[player_id] is None:
+            print(f"[NO FACE] {player_id}")
+            no_face += 1
+            continue
 
-            player["PlayerAppearance"] = appearance
-            updated += 1
+        faces.append(player)
 
-            print(f"[UPDATED] {player['firstName']} {player['lastName']} → {appearance}")
+    # Every face in one matrix, one predict call per classifier
+    matrix = np.array([embeddings[str(player.get("id"))] for player in faces], dtype=np.float32)
+    for player, appearance in zip(faces, predict_appearance(matrix)):
+        player["PlayerAppearance"] = appearance
+        print(f"[UPDATED] {player['firstName']} {player['lastName']} → {appearance}")
 
     print("\n==== SUMMARY ====")
     print(f"Total Players: {total}")
-    print(f"Updated: {updated}")
+    print(f"Updated: {len(faces)}")
     print(f"Missing Images: {missing_images}")
     print(f"No Face Detected: {no_face}")
 
+    return data
+
+
+def update_json():
+    with open(JSON_PATH, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    classify_players(data)
+
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
         json.dump(data, f, indent=2)
 
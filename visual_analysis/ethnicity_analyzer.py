@@ -25,10 +25,8 @@ def analyze_ethnicity(image_dir):
 
     return ethnicity_map
 
-def inject_ethnicity_into_json(json_path, ethnicity_map):
-    with open(json_path, "r", encoding="utf-8") as f:
-        players_by_team = json.load(f)
-
+def apply_ethnicity(players_by_team, ethnicity_map):
+    """Set "ethnicity" on every player found in ethnicity_map. Returns the number updated."""
     updated_count = 0
     for team, players in players_by_team.items():
         for player in players:
@@ -36,6 +34,13 @@ def inject_ethnicity_into_json(json_path, ethnicity_map):
             if pid in ethnicity_map:
                 player["ethnicity"] = ethnicity_map[pid]
                 updated_count += 1
+    return updated_count
+
+def inject_ethnicity_into_json(json_path, ethnicity_map):
+    with open(json_path, "r", encoding="utf-8") as f:
+        players_by_team = json.load(f)
+
+    updated_count = apply_ethnicity(players_by_team, ethnicity_map)
 
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(players_by_team, f, indent=2)
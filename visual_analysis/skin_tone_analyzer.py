@@ -5,7 +5,7 @@ import mediapipe as mp
 import numpy as np
 
 IMAGE_DIR = "mlb_headshots"
-PLAYER_FILE = "../../../Courses/MachineLearning/final-project/mlb_players_with_appearance.json"
+PLAYER_FILE = "jsons/mlb_players_with_appearance.json"
 
 # Game skin tones
 game_skin_colors = {
@@ -24,12 +24,19 @@ def hex_to_rgb(h):
 def color_distance(c1, c2):
     return sum((a - b) ** 2 for a, b in zip(c1, c2)) ** 0.5
 
-# Mediapipe setup
-mp_face = mp.solutions.face_detection
-face_detector = mp_face.FaceDetection(model_selection=1, min_detection_confidence=0.5)
+# Mediapipe setup, created on first use
+face_detector = None
+
+def get_face_detector():
+    global face_detector
+    if face_detector is None:
+        mp_face = mp.solutions.face_detection
+        face_detector = mp_face.FaceDetection(model_selection=1, min_detection_confidence=0.5)
+    return face_detector
 
 def extract_skin_rgb(image_path):
     try:
+        face_detector = get_face_detector()
         img = cv2.imread(str(image_path))
         if img is None: return None
         img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
@@ -66,10 +73,8 @@ def get_skin_tone_from_ethnicity(ethnicity):
         return 3  # Skin4
     return 0  # default fallback
 
-def analyze_skin_tone_and_update_json(image_dir, json_path):
-    with open(json_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-
+def apply_skin_tones(data, image_dir):
+    """Set "SKIN_TONE" on every player from ethnicity and headshot color. Returns the number updated."""
     image_paths = list(Path(image_dir).glob("*.[jp][pn]g")) + list(Path(image_dir).glob("*.bmp"))
     skin_rgb_cache = {}
 
@@ -115,6 +120,14 @@ def analyze_skin_tone_and_update_json(image_dir, json_path):
                 print(f"UPDATED → {player['firstName']} {player['lastName']} ({pid}) | "
                       f"{ethnicity or 'unknown'} → SKIN_TONE = {new_skin}")
 
+    return updated
+
+def analyze_skin_tone_and_update_json(image_dir, json_path):
+    with open(json_path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    updated = apply_skin_tones(data, image_dir)
+
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=2, ensure_ascii=False)
 
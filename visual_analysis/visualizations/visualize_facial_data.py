@@ -1,37 +1,5 @@
-import json
-from collections import Counter
 import matplotlib.pyplot as plt
-
-def load_json(path):
-    with open(path, "r", encoding="utf-8") as f:
-        return json.load(f)
-
-# Extract Appearance
-def extract_data(data):
-    eye_colors = []
-    beard_types = []
-    skin_tones = []
-
-    for team in data:
-        players = data[team]
-
-        for player in players:
-            appearance = player.get("PlayerAppearance", {})
-
-            eye = appearance.get("EyeColor")
-            beard = appearance.get("BeardType")
-            skin = player.get("SKIN_TONE")
-
-            if eye:
-                eye_colors.append(eye.lower())
-
-            if beard:
-                beard_types.append(beard.lower())
-
-            if skin is not None:
-                skin_tones.append(str(int(skin) + 1))
-
-    return eye_colors, beard_types, skin_tones
+from util import player_store
 
 def plot_pie(counter, title):
     labels = list(counter.keys())
@@ -57,15 +25,10 @@ def plot_pie(counter, title):
 
 
 def main():
-    FILE_PATH = "visual_analysis/mlb_players_with_appearance.json"
-
-    data = load_json(FILE_PATH)
-
-    eye_colors, beard_types, skin_tones = extract_data(data)
-
-    eye_counter = Counter(eye_colors)
-    beard_counter = Counter(beard_types)
-    skin_counter = Counter(skin_tones)
+    # Counts come from the player store the pipeline keeps up to date
+    eye_counter = player_store.eye_color_counts()
+    beard_counter = player_store.beard_type_counts()
+    skin_counter = player_store.skin_tone_counts()
 
     print("\nEye Color Stats:", eye_counter)
     print("Beard Type Stats:", beard_counter)